@@ -4,22 +4,27 @@ Deep Research Agent System - Chainlit UI
 Professional multi-agent architecture
 """
 
+import os
+import logging
 import chainlit as cl
 import asyncio
-from main import LeadResearchAgent
-from typing import Optional
+from string import Template
+from semantic_cache import SemanticCache, load_embedder
+from typing import TYPE_CHECKING, Final, Optional
 
-# Global system instance
-research_system: Optional[LeadResearchAgent] = None
+# The research system (openai, agents, httpx) is imported on first chat, not at server start
+if TYPE_CHECKING:
+    from main import LeadResearchAgent
 
-@cl.on_chat_start
-async def start():
-    """Initialize the research system when chat starts"""
-    global research_system
-    
-    # Show welcome message with proper formatting
-    await cl.Message(
-        content="""
+# Agent progress goes to the UI via stream_callback; keep the console log quiet by default
+logging.basicConfig()
+logging.getLogger("deep_research").setLevel(os.getenv("LOG_LEVEL") or "WARNING")
+
+# ============================================================================
+# UI MESSAGES
+# ============================================================================
+
+WELCOME_MD: Final[str] = """
 # 🔬 Deep Research Agent System
 *Professional Multi-Agent Architecture*
 
@@ -63,15 +68,9 @@ async def start():
 3. **Get comprehensive results** with sources and citations
 
 **Ready to start your research!** 🎯
-        """,
-        author="System"
-    ).send()
-    
-    # Initialize the research system
-    try:
-        research_system = LeadResearchAgent()
-        await cl.Message(
-            content="""
+"""
+
+INIT_OK_MD: Final[str] = """
 ## ✅ System Initialized Successfully!
 
 ### 🤖 Agent Status
@@ -85,15 +84,12 @@ async def start():
 | 📚 **Citations** | ✅ Ready | Manages references |
 
 **Ready to start research!** 🚀
-            """,
-            author="System"
-        ).send()
-    except Exception as e:
-        await cl.Message(
-            content=f"""
+"""
+
+INIT_ERR_TMPL: Final[Template] = Template("""
 ## ❌ System Initialization Error
 
-**Error:** `{e}`
+**Error:** `$error`
 
 ### 🔧 Troubleshooting Steps
 1. **Check your `.env` file** - Make sure it exists and has your API keys
@@ -102,38 +98,13 @@ async def start():
 4. **Wait and retry** - Sometimes APIs are temporarily unavailable
 
 **Please fix the issue and refresh the page.**
-            """,
-            author="System"
-        ).send()
+""")
 
-@cl.on_message
-async def main(message: cl.Message):
-    """Handle incoming messages"""
-    global research_system
-    
-    if not research_system:
-        await cl.Message(
-            content="❌ System not initialized. Please refresh the page.",
-            author="System"
-        ).send()
-        return
-    
-    user_question = message.content.strip()
-    
-    if not user_question:
-        await cl.Message(
-            content="Please enter a research question for the multi-agent system to analyze.",
-            author="System"
-        ).send()
-        return
-    
-    # Show the agent flow process
-    await cl.Message(
-        content=f"""
+PROCESS_BANNER_TMPL: Final[Template] = Template("""
 ## 🔄 Multi-Agent Research Process
 
 ### 📝 Your Research Question
-> **"{user_question}"**
+> **"$question"**
 
 ### 🤖 Agent Workflow
 ```
@@ -148,30 +119,9 @@ async def main(message: cl.Message):
 ### ⏳ Processing Status
 **Estimated Time:** 30-60 seconds  
 **Live Updates:** Watch the progress below as agents work together!
-        """,
-        author="System"
-    ).send()
-    
-    try:
-        # Create a streaming message for real-time updates
-        msg = cl.Message(content="", author="Research Agent System")
-        await msg.send()
-        
-        # Stream callback function
-        async def stream_callback(update):
-            msg.content += update + "\n"
-            await msg.update()
-        
-        # Execute the research process with streaming
-        result = await research_system.conduct_research(user_question, stream_callback)
-        
-        # Update the final message with the complete result
-        msg.content = result
-        await msg.update()
-        
-        # Add follow-up
-        await cl.Message(
-            content="""
+""")
+
+COMPLETE_MD: Final[str] = """
 ## 🎉 Research Complete!
 
 ### ✅ Process Summary
@@ -191,19 +141,12 @@ async def main(message: cl.Message):
 - 🎯 **Try different questions** to explore new areas
 
 **The multi-agent system is ready for your next research request!** 🚀
-            """,
-            author="System"
-        ).send()
-        
-    except Exception as e:
-        error_msg = str(e)
-        
-        if "500" in error_msg or "INTERNAL" in error_msg:
-            await cl.Message(
-                content=f"""
+"""
+
+ERR_500_TMPL: Final[Template] = Template("""
 ## ⚠️ Temporary API Error
 
-**Error:** `{error_msg}`
+**Error:** `$error`
 
 ### 🔧 This is a temporary server error on Google's side
 The system will automatically retry with exponential backoff.
@@ -215,15 +158,12 @@ The system will automatically retry with exponential backoff.
 4. Check your internet connection
 
 **The error will likely resolve itself in a few minutes.**
-                """,
-                author="System"
-            ).send()
-        elif "429" in error_msg or "quota" in error_msg.lower():
-            await cl.Message(
-                content=f"""
+""")
+
+ERR_429_TMPL: Final[Template] = Template("""
 ## ⏳ Rate Limit Reached
 
-**Error:** `{error_msg}`
+**Error:** `$error`
 
 ### 🔧 You've hit the API rate limit
 The system will automatically retry with backoff.
@@ -235,15 +175,12 @@ The system will automatically retry with backoff.
 4. Try a simpler research question
 
 **Rate limits reset every minute.**
-                """,
-                author="System"
-            ).send()
-        else:
-            await cl.Message(
-                content=f"""
+""")
+
+ERR_GENERIC_TMPL: Final[Template] = Template("""
 ## 🚨 System Error
 
-**Error:** `{error_msg}`
+**Error:** `$error`
 
 ### 🔧 Possible Solutions
 1. **Check your internet connection**
@@ -252,7 +189,118 @@ The system will automatically retry with backoff.
 4. **Try a simpler research question**
 
 **Please try again or check the system status.**
-                """,
+""")
+
+# Global system instance
+research_system: Optional["LeadResearchAgent"] = None
+
+@cl.cache
+def get_system() -> "LeadResearchAgent":
+    """Build the research system and its agents once and share them across chat sessions"""
+    from main import LeadResearchAgent
+    return LeadResearchAgent()
+
+@cl.cache
+def get_semantic_cache() -> SemanticCache:
+    """Share the semantic cache across sessions (it loads the embedding model in a thread on first use)"""
+    return SemanticCache(load_embedder, path=os.getenv("SEMANTIC_CACHE_PATH") or None)
+
+@cl.on_chat_start
+async def start():
+    """Initialize the research system when chat starts"""
+    global research_system
+    
+    # Show welcome message with proper formatting
+    await cl.Message(
+        content=WELCOME_MD,
+        author="System"
+    ).send()
+    
+    # Initialize the research system
+    try:
+        research_system = get_system()
+        await cl.Message(
+            content=INIT_OK_MD,
+            author="System"
+        ).send()
+    except Exception as e:
+        await cl.Message(
+            content=INIT_ERR_TMPL.substitute(error=e),
+            author="System"
+        ).send()
+
+@cl.on_message
+async def main(message: cl.Message):
+    """Handle incoming messages"""
+    global research_system
+    
+    if not research_system:
+        await cl.Message(
+            content="❌ System not initialized. Please refresh the page.",
+            author="System"
+        ).send()
+        return
+    
+    user_question = message.content.strip()
+    
+    if not user_question:
+        await cl.Message(
+            content="Please enter a research question for the multi-agent system to analyze.",
+            author="System"
+        ).send()
+        return
+    
+    # Show the agent flow process
+    await cl.Message(
+        content=PROCESS_BANNER_TMPL.substitute(question=user_question),
+        author="System"
+    ).send()
+    
+    try:
+        # Agent progress streams into its own step, so the report message only ever carries the report
+        async with cl.Step(name="Research Agent System", type="run") as progress:
+            
+            # Stream callback function - push each update as a delta instead of re-sending the whole step
+            async def stream_callback(update):
+                await progress.stream_token(update + "\n")
+            
+            # Reuse the report of a previous, semantically similar question if there is one
+            semantic_cache = get_semantic_cache()
+            result = await semantic_cache.lookup(user_question)
+            
+            if result is None:
+                # Execute the research process with streaming
+                result = await research_system.conduct_research(user_question, stream_callback)
+                await semantic_cache.add(user_question, result)
+        
+        # Nothing of the report has been sent yet: stream it once and let send() finish the stream,
+        # instead of overwriting an already streamed message with the whole report
+        msg = cl.Message(content="", author="Research Agent System")
+        await msg.stream_token(result)
+        await msg.send()
+        
+        # Add follow-up
+        await cl.Message(
+            content=COMPLETE_MD,
+            author="System"
+        ).send()
+        
+    except Exception as e:
+        error_msg = str(e)
+        
+        if "500" in error_msg or "INTERNAL" in error_msg:
+            await cl.Message(
+                content=ERR_500_TMPL.substitute(error=error_msg),
+                author="System"
+            ).send()
+        elif "429" in error_msg or "quota" in error_msg.lower():
+            await cl.Message(
+                content=ERR_429_TMPL.substitute(error=error_msg),
+                author="System"
+            ).send()
+        else:
+            await cl.Message(
+                content=ERR_GENERIC_TMPL.substitute(error=error_msg),
                 author="System"
             ).send()
 
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+LLM Response Cache - Deterministic prompt-hash cache for agent LLM calls
+Skips repeated Runner.run round-trips when the same model, agent and prompt are seen again
+"""
+
+import os
+import time
+import asyncio
+import logging
+import hashlib
+import functools
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+import orjson
+from agents import Agent, Runner
+
+from persistence import SnapshotWriter
+from rate_limiter import GEMINI_BUCKET, GEMINI_CONCURRENCY
+
+logger = logging.getLogger("deep_research")
+
+# ============================================================================
+# CACHE BACKEND
+# ============================================================================
+
+class LLMCache:
+    """In-memory LRU cache of LLM outputs with TTL and optional on-disk JSON persistence"""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 24 * 60 * 60, path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self.stats = {"hits": 0, "misses": 0}
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()  # key -> (expires_at, output)
+        self._lock = asyncio.Lock()
+        self._writer = SnapshotWriter(path, "LLM cache") if path else None
+        if self.path:
+            self._load()
+
+    @staticmethod
+    def cache_key(model: str, agent_name: str, prompt: str) -> str:
+        """Build a deterministic cache key from model, agent and prompt"""
+        return hashlib.sha256(f"{model}\x00{agent_name}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        """Return the cached output for a key, or None on miss/expiry"""
+        async with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.time():
+                if entry is not None:
+                    del self._entries[key]
+                self.stats["misses"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry[1]
+
+    async def set(self, key: str, value: str):
+        """Store an output, evicting the least recently used entry when full"""
+        async with self._lock:
+            self._entries[key] = (time.time() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            snapshot = dict(self._entries) if self.path else None
+
+        if snapshot is not None:
+            await self._writer.write(snapshot)
+
+    def _load(self):
+        """Load unexpired entries from the on-disk JSON file"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "rb") as f:
+                data = orjson.loads(f.read())
+        except (OSError, ValueError) as e:
+            logger.warning("⚠️  Could not load LLM cache from %s: %s", self.path, e)
+            return
+
+        now = time.time()
+        for key, (expires_at, value) in data.items():
+            if expires_at >= now:
+                self._entries[key] = (expires_at, value)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+@functools.lru_cache(maxsize=1)
+def get_llm_cache() -> LLMCache:
+    """Shared cache instance, created on first use (set LLM_CACHE_PATH to persist across restarts)"""
+    return LLMCache(path=os.getenv("LLM_CACHE_PATH") or None)
+
+# ============================================================================
+# RUNNER WRAPPER
+# ============================================================================
+
+def _is_deterministic(agent: Agent) -> bool:
+    """Only agents with an explicit temperature of 0 are safe to cache (None means the model's non-zero default)"""
+    temperature = getattr(getattr(agent, "model_settings", None), "temperature", None)
+    return temperature == 0
+
+async def cached_run(agent: Agent, prompt: str, model_name: str, cache: Optional[LLMCache] = None) -> Any:
+    """Run an agent and return its final output, reusing a cached output when available"""
+    if cache is None:
+        cache = get_llm_cache()
+
+    if not _is_deterministic(agent):
+        await GEMINI_BUCKET.acquire()
+        async with GEMINI_CONCURRENCY:
+            result = await Runner.run(agent, prompt)
+        return result.final_output
+
+    key = cache.cache_key(model_name, agent.name, prompt)
+    cached = await cache.get(key)
+    if cached is not None:
+        return cached
+
+    await GEMINI_BUCKET.acquire()
+    async with GEMINI_CONCURRENCY:
+        result = await Runner.run(agent, prompt)
+    await cache.set(key, result.final_output)
+    return result.final_output
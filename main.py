@@ -5,24 +5,142 @@ Based on the flowchart: User -> Requirement Gathering -> Planning -> Lead Resear
 """
 
 import os
+import re
 import asyncio
+import logging
 import time
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+import random
+import weakref
+import functools
+import itertools
+import contextvars
+from collections import OrderedDict, deque
+from types import MappingProxyType
+from typing import List, Dict, Any, Awaitable, Callable, Mapping, Optional, Sequence, Set, Tuple
+from dataclasses import dataclass, field, replace
 from dotenv import load_dotenv
 
-from openai import AsyncOpenAI
-from agents import Agent, Runner, OpenAIChatCompletionsModel, function_tool, set_tracing_disabled, handoff
+import httpx
+import openai
+import orjson
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+from openai.types.responses import ResponseTextDeltaEvent
+from agents import Agent, ModelSettings, Runner, OpenAIChatCompletionsModel, ToolCallOutputItem, function_tool, set_tracing_disabled, handoff
 
-# Load environment variables
-load_dotenv()
-set_tracing_disabled(disabled=True)
+from llm_cache import cached_run
+from rate_limiter import AsyncTokenBucket, GEMINI_BUCKET, GEMINI_CONCURRENCY, TAVILY_BUCKET, TAVILY_CONCURRENCY
+from parsing import (
+    match_requirement_keywords, classify_source, assess_source_quality,
+    extract_conflicts, categorize_conflict, CONFLICT_CATEGORIES
+)
+from semantic_cache import SemanticCache, load_embedder
+
+@functools.lru_cache(maxsize=1)
+def init_environment():
+    """Load environment variables and configure the Agents SDK (once per process)"""
+    load_dotenv()
+    set_tracing_disabled(disabled=True)
+
+# Progress logging (silent unless LOG_LEVEL enables INFO/DEBUG; the UI uses stream_callback)
+logger = logging.getLogger("deep_research")
+
+# ============================================================================
+# SHARED LLM CLIENT
+# ============================================================================
+
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/openai/"
+GEMINI_MODEL = "gemini-2.5-flash"
+
+# One client (and so one HTTP connection pool) per event loop, shared by all agents
+_client_by_loop: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = weakref.WeakKeyDictionary()
+_model_by_client: "weakref.WeakKeyDictionary[AsyncOpenAI, OpenAIChatCompletionsModel]" = weakref.WeakKeyDictionary()
+
+def _create_client() -> AsyncOpenAI:
+    """Create a Gemini client with a bounded keep-alive connection pool"""
+    gemini_key = os.getenv("GEMINI_API_KEY")
+    
+    if not gemini_key:
+        raise ValueError("GEMINI_API_KEY not found. Please set your Gemini API key.")
+    
+    return AsyncOpenAI(
+        api_key=gemini_key,
+        base_url=GEMINI_BASE_URL,
+        http_client=DefaultAsyncHttpxClient(
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16)
+        )
+    )
+
+def get_client() -> AsyncOpenAI:
+    """Return the shared client bound to the running event loop, creating it on first use"""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # No running loop (synchronous construction) - nothing to share the pool with
+        return _create_client()
+    
+    client = _client_by_loop.get(loop)
+    if client is None:
+        client = _create_client()
+        _client_by_loop[loop] = client
+    return client
+
+def get_model(client: AsyncOpenAI) -> OpenAIChatCompletionsModel:
+    """Return the shared Gemini chat model for a client, creating it on first use"""
+    model = _model_by_client.get(client)
+    if model is None:
+        model = OpenAIChatCompletionsModel(model=GEMINI_MODEL, openai_client=client)
+        _model_by_client[client] = model
+    return model
+
+def _is_retryable(error: Exception) -> bool:
+    """Rate limits, server errors and connection failures are worth retrying"""
+    if isinstance(error, (openai.RateLimitError, openai.InternalServerError, openai.APIConnectionError)):
+        return True
+    return isinstance(error, openai.APIStatusError) and (error.status_code == 429 or error.status_code >= 500)
+
+# ============================================================================
+# CONFLICT RESOLUTION
+# ============================================================================
+
+# Resolution strategy per conflict category (read-only, shared by every call)
+_CONFLICT_RESOLUTIONS: Dict[str, Mapping[str, Any]] = {
+    "temporal": MappingProxyType({
+        "type": "temporal",
+        "strategy": "prioritize_recent_sources",
+        "resolution": "Prioritizing more recent sources and noting temporal context",
+        "confidence": 0.8
+    }),
+    "methodological": MappingProxyType({
+        "type": "methodological",
+        "strategy": "compare_methodologies",
+        "resolution": "Comparing different methodological approaches and noting their respective strengths",
+        "confidence": 0.7
+    }),
+    "perspectival": MappingProxyType({
+        "type": "perspectival",
+        "strategy": "acknowledge_multiple_perspectives",
+        "resolution": "Acknowledging multiple valid perspectives and providing balanced analysis",
+        "confidence": 0.9
+    }),
+    "data_quality": MappingProxyType({
+        "type": "data_quality",
+        "strategy": "assess_source_reliability",
+        "resolution": "Assessing source reliability and prioritizing higher-quality sources",
+        "confidence": 0.8
+    }),
+}
 
 # ============================================================================
 # DATA STRUCTURES
 # ============================================================================
 
-@dataclass
+# Citation styles are pure functions of the citation metadata
+CITATION_TEMPLATES = {
+    "APA": "{author} ({date}). {title}. Retrieved from {url}",
+    "MLA": '{author}. "{title}." {date}, {url}.',
+}
+
+@dataclass(slots=True, frozen=True)
 class SearchResult:
     """Search result from web search"""
     title: str
@@ -31,7 +149,7 @@ class SearchResult:
     source_type: str
     relevance_score: float
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Citation:
     """Professional citation information"""
     id: int
@@ -44,12 +162,35 @@ class Citation:
     doi: Optional[str] = None
     reliability_score: float = 0.0
     quality_score: float = 0.5
+    _apa: Optional[str] = field(default=None, init=False, repr=False, compare=False)  # cached APA string
     
-    def to_apa_format(self) -> str:
-        """Convert to APA citation format"""
-        return f"{self.author or 'Unknown'} ({self.publication_date or 'n.d.'}). {self.title}. Retrieved from {self.url}"
+    @property
+    def has_metadata(self) -> bool:
+        """Whether author and date are known, so the citation can be formatted without the LLM"""
+        return self.author is not None and self.publication_date is not None
+    
+    @property
+    def apa(self) -> str:
+        """APA citation format, built on first access and reused afterwards"""
+        if self._apa is None:
+            object.__setattr__(self, "_apa", self._render(CITATION_TEMPLATES["APA"]))
+        return self._apa
+    
+    def format(self, style: str = "APA") -> str:
+        """Format the citation in the given style from its template"""
+        if style.upper() == "APA":
+            return self.apa
+        return self._render(CITATION_TEMPLATES[style.upper()])
+    
+    def _render(self, template: str) -> str:
+        return template.format(
+            author=self.author or "Unknown",
+            date=self.publication_date or "n.d.",
+            title=self.title,
+            url=self.url
+        )
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ResearchRequirement:
     """Research requirements gathered from user"""
     original_question: str
@@ -62,7 +203,7 @@ class ResearchRequirement:
     research_history: List[str] = None
     expertise_level: str = "intermediate"
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ResearchPlan:
     """Research plan with tasks and approach"""
     original_question: str
@@ -72,7 +213,7 @@ class ResearchPlan:
     success_criteria: List[str]
     required_agents: List[str]
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ResearchResult:
     """Result from research execution"""
     content: str
@@ -81,6 +222,60 @@ class ResearchResult:
     conflicts_noted: List[str]
     quality_score: float
 
+@dataclass(slots=True)
+class AgentMetrics:
+    """Running call counters for one agent (mutable, updated on every logged execution)"""
+    total_calls: int = 0
+    successful_calls: int = 0
+    total_duration: float = 0.0
+    
+    @property
+    def average_duration(self) -> float:
+        return self.total_duration / self.total_calls if self.total_calls else 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total_calls": self.total_calls,
+            "successful_calls": self.successful_calls,
+            "total_duration": self.total_duration,
+            "average_duration": self.average_duration
+        }
+
+@dataclass(slots=True)
+class RunCounters:
+    """Operation counters for one conduct_research call (the agent instance is shared across sessions)"""
+    total_ops: int = 0
+    successful_ops: int = 0
+    handoff_count: int = 0
+    
+    @property
+    def success_rate(self) -> float:
+        return self.successful_ops / self.total_ops if self.total_ops else 0.0
+
+# Counters of the conduct_research call running in the current task (tasks it starts inherit them)
+_run_counters: "contextvars.ContextVar[Optional[RunCounters]]" = contextvars.ContextVar("run_counters", default=None)
+
+@dataclass(slots=True, frozen=True)
+class TraceEntry:
+    """One logged agent execution; the details message is only formatted when the entry is reported"""
+    timestamp: float
+    agent: str
+    action: str
+    duration: Optional[float]
+    success: bool
+    details_fmt: str
+    details_args: Tuple[Any, ...]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "timestamp": self.timestamp,
+            "agent": self.agent,
+            "action": self.action,
+            "duration": self.duration,
+            "success": self.success,
+            "details": self.details_fmt % self.details_args if self.details_args else self.details_fmt
+        }
+
 # ============================================================================
 # REQUIREMENT GATHERING AGENT
 # ============================================================================
@@ -105,43 +300,40 @@ class RequirementGatheringAgent:
                 "3. Identify any specific requirements they have\n"
                 "4. Determine the best way to research their question\n"
                 "5. Set clear goals for the research\n\n"
+                "When given a user research request, analyze it and gather comprehensive requirements.\n"
+                "Please provide:\n"
+                "1. Clarified research question (if the original needs clarification)\n"
+                "2. Recommended research depth (basic/standard/deep/expert)\n"
+                "3. Specific requirements and constraints\n"
+                "4. User context and preferences\n"
+                "5. Clear success criteria\n\n"
+                "Format your response as a structured analysis.\n\n"
                 "Always be helpful and clear in understanding what users need."
             ),
-            model=self.model
+            model=self.model,
+            model_settings=ModelSettings(temperature=0)  # deterministic, so cached_run can reuse its output
         )
     
     async def gather_requirements(self, user_input: str, stream_callback=None) -> ResearchRequirement:
         """Gather and clarify research requirements"""
         if stream_callback:
             await stream_callback("🔍 **REQUIREMENT GATHERING AGENT**\n" + "-" * 40)
-        print("🔍 REQUIREMENT GATHERING AGENT")
-        print("-" * 40)
-        
-        gathering_prompt = f"""
-        Analyze this user research request and gather comprehensive requirements:
+        logger.info("🔍 REQUIREMENT GATHERING AGENT")
         
-        User Input: {user_input}
+        # The checklist lives in the agent instructions (a static, cacheable prefix);
+        # only the user input goes into the user turn
+        gathering_prompt = f"User Input: {user_input}"
         
-        Please provide:
-        1. Clarified research question (if the original needs clarification)
-        2. Recommended research depth (basic/standard/deep/expert)
-        3. Specific requirements and constraints
-        4. User context and preferences
-        5. Clear success criteria
-        
-        Format your response as a structured analysis.
-        """
-        
-        result = await Runner.run(self.agent, gathering_prompt)
+        output = await cached_run(self.agent, gathering_prompt, self.model.model)
         
         # Parse the response into ResearchRequirement
-        requirements = self._parse_requirements(user_input, result.final_output)
+        requirements = self._parse_requirements(user_input, output)
         
         if stream_callback:
             await stream_callback(f"✅ **Requirements gathered**: {requirements.clarified_question}")
             await stream_callback(f"📊 **Research depth**: {requirements.research_depth}")
-        print(f"✅ Requirements gathered: {requirements.clarified_question}")
-        print(f"📊 Research depth: {requirements.research_depth}")
+        logger.info("✅ Requirements gathered: %s", requirements.clarified_question)
+        logger.info("📊 Research depth: %s", requirements.research_depth)
         
         return requirements
     
@@ -150,20 +342,17 @@ class RequirementGatheringAgent:
         # Use the original question as the clarified question since parsing is complex
         clarified_question = original
         
+        # Scan the question once for all requirement keywords
+        keywords = match_requirement_keywords(original)
+        
         # Determine research depth based on question complexity
-        question_lower = original.lower()
-        if any(word in question_lower for word in ["compare", "analyze", "evaluate", "comprehensive", "detailed"]):
-            research_depth = "deep"
-        elif any(word in question_lower for word in ["what is", "define", "explain"]):
-            research_depth = "standard"
-        else:
-            research_depth = "standard"
+        research_depth = "deep" if "deep" in keywords else "standard"
         
         # Determine expertise level based on question complexity
-        expertise_level = self._assess_expertise_level(original)
+        expertise_level = self._assess_expertise_level(original, keywords)
         
         # Extract user preferences from question
-        user_preferences = self._extract_user_preferences(original)
+        user_preferences = self._extract_user_preferences(original, keywords)
         
         return ResearchRequirement(
             original_question=original,
@@ -177,30 +366,23 @@ class RequirementGatheringAgent:
             expertise_level=expertise_level
         )
     
-    def _assess_expertise_level(self, question: str) -> str:
+    def _assess_expertise_level(self, question: str, keywords: Optional[Set[str]] = None) -> str:
         """Assess user expertise level based on question complexity"""
-        question_lower = question.lower()
-        
-        # Expert level indicators
-        expert_indicators = [
-            "methodology", "framework", "paradigm", "theoretical", "empirical",
-            "quantitative", "qualitative", "meta-analysis", "systematic review"
-        ]
+        if keywords is None:
+            keywords = match_requirement_keywords(question)
         
-        # Beginner level indicators
-        beginner_indicators = [
-            "what is", "define", "explain", "basics", "introduction", "simple"
-        ]
-        
-        if any(indicator in question_lower for indicator in expert_indicators):
+        if "expert" in keywords:
             return "expert"
-        elif any(indicator in question_lower for indicator in beginner_indicators):
+        elif "beginner" in keywords:
             return "beginner"
         else:
             return "intermediate"
     
-    def _extract_user_preferences(self, question: str) -> Dict[str, Any]:
+    def _extract_user_preferences(self, question: str, keywords: Optional[Set[str]] = None) -> Dict[str, Any]:
         """Extract user preferences from the question"""
+        if keywords is None:
+            keywords = match_requirement_keywords(question)
+        
         preferences = {
             "preferred_sources": [],
             "detail_level": "standard",
@@ -208,20 +390,18 @@ class RequirementGatheringAgent:
             "avoid_areas": []
         }
         
-        question_lower = question.lower()
-        
         # Extract focus areas
-        if "technical" in question_lower or "technical details" in question_lower:
+        if "focus_technical" in keywords:
             preferences["focus_areas"].append("technical")
-        if "practical" in question_lower or "application" in question_lower:
+        if "focus_practical" in keywords:
             preferences["focus_areas"].append("practical")
-        if "academic" in question_lower or "research" in question_lower:
+        if "focus_academic" in keywords:
             preferences["focus_areas"].append("academic")
         
         # Extract detail level
-        if "detailed" in question_lower or "comprehensive" in question_lower:
+        if "detail_high" in keywords:
             preferences["detail_level"] = "high"
-        elif "brief" in question_lower or "summary" in question_lower:
+        elif "detail_low" in keywords:
             preferences["detail_level"] = "low"
         
         return preferences
@@ -233,9 +413,10 @@ class RequirementGatheringAgent:
 class PlanningAgent:
     """Agent that creates detailed research plans"""
     
-    def __init__(self, client: AsyncOpenAI, model: OpenAIChatCompletionsModel):
+    def __init__(self, client: AsyncOpenAI, model: OpenAIChatCompletionsModel, use_llm_plan: bool = False):
         self.client = client
         self.model = model
+        self.use_llm_plan = use_llm_plan
         self.setup_agent()
     
     def setup_agent(self):
@@ -250,47 +431,47 @@ class PlanningAgent:
                 "3. Identify which specialists are needed for each step\n"
                 "4. Estimate how long each step will take\n"
                 "5. Make sure all aspects of the question are covered\n\n"
+                "When given research requirements, create a detailed research plan that includes:\n"
+                "1. Research approach and methodology\n"
+                "2. Specific tasks with clear descriptions\n"
+                "3. Required agents for each task (Search, Reflection, Citations)\n"
+                "4. Task dependencies and handoff points\n"
+                "5. Estimated duration for each task\n"
+                "6. Quality checkpoints\n\n"
+                "Format as a structured research plan.\n\n"
                 "Always create practical, easy-to-follow research plans."
             ),
-            model=self.model
+            model=self.model,
+            model_settings=ModelSettings(temperature=0)  # deterministic, so cached_run can reuse its output
         )
     
     async def create_plan(self, requirements: ResearchRequirement, stream_callback=None) -> ResearchPlan:
         """Create a comprehensive research plan"""
         if stream_callback:
             await stream_callback("📋 **PLANNING AGENT**\n" + "-" * 40)
-        print("📋 PLANNING AGENT")
-        print("-" * 40)
-        
-        planning_prompt = f"""
-        Create a detailed research plan based on these requirements:
-        
-        Research Question: {requirements.clarified_question}
-        Research Depth: {requirements.research_depth}
-        Specific Requirements: {requirements.specific_requirements}
-        Success Criteria: {requirements.success_criteria}
-        
-        Create a plan that includes:
-        1. Research approach and methodology
-        2. Specific tasks with clear descriptions
-        3. Required agents for each task (Search, Reflection, Citations)
-        4. Task dependencies and handoff points
-        5. Estimated duration for each task
-        6. Quality checkpoints
-        
-        Format as a structured research plan.
-        """
-        
-        result = await Runner.run(self.agent, planning_prompt)
+        logger.info("📋 PLANNING AGENT")
+        
+        # _parse_plan builds the tasks from the research depth alone, so the LLM is only
+        # asked for a plan when use_llm_plan is set
+        output = ""
+        if self.use_llm_plan:
+            planning_prompt = (
+                f"Research Question: {requirements.clarified_question}\n"
+                f"Research Depth: {requirements.research_depth}\n"
+                f"Specific Requirements: {requirements.specific_requirements}\n"
+                f"Success Criteria: {requirements.success_criteria}"
+            )
+            
+            output = await cached_run(self.agent, planning_prompt, self.model.model)
         
         # Parse into ResearchPlan
-        plan = self._parse_plan(requirements, result.final_output)
+        plan = self._parse_plan(requirements, output)
         
         if stream_callback:
             await stream_callback(f"✅ **Plan created**: {len(plan.tasks)} tasks")
             await stream_callback(f"⏱️  **Estimated duration**: {plan.estimated_duration}")
-        print(f"✅ Plan created: {len(plan.tasks)} tasks")
-        print(f"⏱️  Estimated duration: {plan.estimated_duration}")
+        logger.info("✅ Plan created: %d tasks", len(plan.tasks))
+        logger.info("⏱️  Estimated duration: %s", plan.estimated_duration)
         
         return plan
     
@@ -299,24 +480,26 @@ class PlanningAgent:
         # Create default tasks based on research depth
         tasks = []
         
+        # "depends_on" lists the task ids whose results a task needs; tasks with no
+        # outstanding dependencies on each other are executed concurrently
         if requirements.research_depth == "basic":
             tasks = [
-                {"id": "search_basic", "description": "Basic search for key facts", "agent": "Search", "duration": "5-10 min"},
-                {"id": "synthesize_basic", "description": "Synthesize basic findings", "agent": "Reflection", "duration": "5-10 min"}
+                {"id": "search_basic", "description": "Basic search for key facts", "agent": "Search", "duration": "5-10 min", "depends_on": []},
+                {"id": "synthesize_basic", "description": "Synthesize basic findings", "agent": "Reflection", "duration": "5-10 min", "depends_on": ["search_basic"]}
             ]
         elif requirements.research_depth == "standard":
             tasks = [
-                {"id": "search_comprehensive", "description": "Comprehensive search for facts and data", "agent": "Search", "duration": "10-15 min"},
-                {"id": "analyze_sources", "description": "Analyze and validate sources", "agent": "Reflection", "duration": "5-10 min"},
-                {"id": "create_citations", "description": "Create proper citations", "agent": "Citations", "duration": "5-10 min"}
+                {"id": "search_comprehensive", "description": "Comprehensive search for facts and data", "agent": "Search", "duration": "10-15 min", "depends_on": []},
+                {"id": "analyze_sources", "description": "Analyze and validate sources", "agent": "Reflection", "duration": "5-10 min", "depends_on": ["search_comprehensive"]},
+                {"id": "create_citations", "description": "Create proper citations", "agent": "Citations", "duration": "5-10 min", "depends_on": ["search_comprehensive"]}
             ]
         else:  # deep or expert
             tasks = [
-                {"id": "search_primary", "description": "Primary source research", "agent": "Search", "duration": "15-20 min"},
-                {"id": "search_secondary", "description": "Secondary source research", "agent": "Search", "duration": "10-15 min"},
-                {"id": "analyze_conflicts", "description": "Analyze conflicting information", "agent": "Reflection", "duration": "10-15 min"},
-                {"id": "synthesize_findings", "description": "Synthesize all findings", "agent": "Reflection", "duration": "10-15 min"},
-                {"id": "create_citations", "description": "Create comprehensive citations", "agent": "Citations", "duration": "10-15 min"}
+                {"id": "search_primary", "description": "Primary source research", "agent": "Search", "duration": "15-20 min", "depends_on": []},
+                {"id": "search_secondary", "description": "Secondary source research", "agent": "Search", "duration": "10-15 min", "depends_on": []},
+                {"id": "analyze_conflicts", "description": "Analyze conflicting information", "agent": "Reflection", "duration": "10-15 min", "depends_on": ["search_primary", "search_secondary"]},
+                {"id": "synthesize_findings", "description": "Synthesize all findings", "agent": "Reflection", "duration": "10-15 min", "depends_on": ["search_primary", "search_secondary"]},
+                {"id": "create_citations", "description": "Create comprehensive citations", "agent": "Citations", "duration": "10-15 min", "depends_on": ["search_primary", "search_secondary"]}
             ]
         
         return ResearchPlan(
@@ -332,6 +515,8 @@ class PlanningAgent:
 # SPECIALIST AGENTS
 # ============================================================================
 
+TAVILY_SEARCH_URL = "https://api.tavily.com/search"
+
 class SearchAgent:
     """Specialist agent for web search and data gathering"""
     
@@ -339,50 +524,69 @@ class SearchAgent:
         self.client = client
         self.model = model
         self.tavily_key = os.getenv("TAVILY_API_KEY")
+        # One pooled async HTTP client reused by every search_web call
+        self._http = httpx.AsyncClient(
+            headers={"Authorization": f"Bearer {self.tavily_key}"},
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            timeout=httpx.Timeout(15.0)
+        )
+        # Two-tier result cache: exact normalized query (LRU), then embedding similarity;
+        # both expire entries after the same TTL so web results do not go stale
+        self._exact_cache: "OrderedDict[str, Tuple[float, ResearchResult]]" = OrderedDict()  # key -> (expires_at, result)
+        self._exact_capacity = 1024
+        self._cache_ttl = 24 * 60 * 60
+        self._semantic_cache = SemanticCache(
+            load_embedder, ttl_seconds=self._cache_ttl, path=os.getenv("SEARCH_CACHE_PATH") or None
+        )
         self.setup_agent()
     
+    async def aclose(self):
+        """Close the pooled Tavily HTTP client"""
+        await self._http.aclose()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+    
     def setup_agent(self):
         """Setup the search agent"""
         @function_tool
         async def search_web(query: str, num_results: int = 5) -> str:
             """Search the web for information using Tavily"""
-            print(f"🔍 SEARCH_WEB TOOL CALLED with query: '{query}'")
+            logger.debug("🔍 SEARCH_WEB TOOL CALLED with query: %r", query)
             try:
                 if self.tavily_key:
-                    from tavily import TavilyClient
-                    client = TavilyClient(api_key=self.tavily_key)
-                    response = client.search(
-                        query=query,
-                        search_depth="advanced",
-                        max_results=num_results,
-                        include_answer=True
-                    )
-                    
-                    # Format results in a user-friendly way
-                    search_results = []
+                    response = await self._post_search({
+                        "query": query,
+                        "search_depth": "advanced",
+                        "max_results": num_results,
+                        "include_answer": True
+                    })
                     
-                    # Add a summary if available
-                    if response.get('answer'):
-                        search_results.append(f"**Summary:** {response['answer']}\n")
+                    results = response.get('results') or []
+                    answer = response.get('answer')
                     
-                    # Add individual results
-                    for i, item in enumerate(response.get('results', []), 1):
-                        title = item.get('title', 'Untitled')
-                        content = item.get('content', 'No content available')
-                        url = item.get('url', 'No URL available')
-                        
-                        # Truncate content to be more readable
-                        if len(content) > 200:
-                            content = content[:200] + "..."
-                        
-                        search_results.append(f"**{i}. {title}**\n{content}\n*Source: {url}*\n")
+                    # Structured output: the agent presents it, and search() reads sources from it directly
+                    output = orjson.dumps({
+                        "summary": answer,
+                        "results": [
+                            {
+                                "title": item.get('title', 'Untitled'),
+                                "url": item.get('url', 'No URL available'),
+                                "content": self._truncate(item.get('content', 'No content available'))
+                            }
+                            for item in results
+                        ]
+                    }).decode()
                     
-                    print(f"✅ Search successful, found {len(response.get('results', []))} results")
-                    return "\n".join(search_results)
+                    logger.debug("✅ Search successful, found %d results", len(results))
+                    return output
                 else:
                     return "I'm unable to search the web right now. Please check the system configuration."
             except Exception as e:
-                print(f"❌ Search error: {e}")
+                logger.warning("❌ Search error: %s", e)
                 return "I encountered an issue while searching. Please try again or check your internet connection."
         
         self.agent = Agent(
@@ -392,7 +596,8 @@ class SearchAgent:
                 "IMPORTANT: You MUST call the search_web tool with the exact query provided.\n\n"
                 "Process:\n"
                 "1. Call search_web(query) with the exact search query\n"
-                "2. Present the results from the tool in a clear format\n"
+                "2. The tool returns JSON with a summary and a list of results (title, url, content).\n"
+                "   Present the summary, then each result's title, content and source URL in a clear format\n"
                 "3. Do NOT provide your own analysis or commentary\n"
                 "4. Do NOT ask for clarification\n\n"
                 "Example: If asked 'What is AI?', call search_web('What is AI?') and present those results."
@@ -401,139 +606,172 @@ class SearchAgent:
             tools=[search_web]
         )
     
+    async def _post_search(self, payload: Dict[str, Any], max_retries: int = 3, base_delay: float = 0.5) -> Dict[str, Any]:
+        """POST a Tavily search, retrying connection errors and timeouts with exponential backoff"""
+        for attempt in range(max_retries):
+            await TAVILY_BUCKET.acquire()
+            try:
+                async with TAVILY_CONCURRENCY:
+                    reply = await self._http.post(
+                        TAVILY_SEARCH_URL, content=orjson.dumps(payload), headers={"Content-Type": "application/json"}
+                    )
+            except httpx.TransportError as e:  # DNS failures, refused/dropped connections, timeouts
+                if attempt == max_retries - 1:
+                    raise
+                delay = base_delay * (2 ** attempt) + random.random() * base_delay
+                logger.warning("⚠️  Tavily connection error (attempt %d/%d): %s - retrying in %.1fs",
+                               attempt + 1, max_retries, e, delay)
+                await asyncio.sleep(delay)
+                continue
+            reply.raise_for_status()
+            return orjson.loads(reply.content)
+        raise RuntimeError(f"Tavily search failed after {max_retries} attempts")
+    
+    @staticmethod
+    def _truncate(content: str, limit: int = 200) -> str:
+        """Truncate result content to be more readable"""
+        return content[:limit] + "..." if len(content) > limit else content
+    
     async def search(self, query: str, context: str = "") -> ResearchResult:
         """Perform search and return structured results"""
-        print(f"🔍 SEARCH AGENT: {query}")
+        logger.info("🔍 SEARCH AGENT: %s", query)
+        
+        key = query.strip().lower()
+        cached = self._exact_cache.get(key)
+        if cached is not None:
+            expires_at, research_result = cached
+            if expires_at >= time.time():
+                self._exact_cache.move_to_end(key)
+                logger.debug("♻️  Search cache hit (exact): %s", query)
+                return research_result
+            del self._exact_cache[key]
+        
+        return await self._search_uncached(query, key)
+    
+    async def _search_uncached(self, query: str, key: str) -> ResearchResult:
+        """Search via the semantic cache or the agent, storing the result for reuse"""
+        cached = self._decode_cached(await self._semantic_cache.lookup(query))
+        if cached is not None:
+            logger.debug("♻️  Search cache hit (semantic): %s", query)
+            research_result = self._build_result(*cached)
+            self._remember(key, research_result)
+            return research_result
         
         search_prompt = f"Search for: {query}"
         
-        result = await Runner.run(self.agent, search_prompt)
+        await GEMINI_BUCKET.acquire()
+        async with GEMINI_CONCURRENCY:
+            result = await Runner.run(self.agent, search_prompt)
         
-        # Parse results
-        sources = self._extract_sources(result.final_output)
+        tool_results = self._tool_results(result)
+        research_result = self._build_result(result.final_output, tool_results)
         
-        print(f"🔍 EXTRACTED SOURCES: {len(sources)}")
-        for i, source in enumerate(sources):
-            print(f"  {i+1}. {source.title} - {source.url}")
+        # Only cache searches that produced sources, not tool error messages
+        if research_result.sources:
+            self._remember(key, research_result)
+            await self._semantic_cache.add(
+                query, orjson.dumps({"content": result.final_output, "results": tool_results}).decode()
+            )
+        
+        return research_result
+    
+    @staticmethod
+    def _tool_results(run_result) -> List[Dict[str, Any]]:
+        """Collect the structured results returned by search_web during an agent run"""
+        results = []
+        for item in run_result.new_items:
+            if isinstance(item, ToolCallOutputItem) and isinstance(item.output, str):
+                try:
+                    results.extend(orjson.loads(item.output)["results"])
+                except (orjson.JSONDecodeError, KeyError, TypeError):
+                    continue  # Plain-text tool message (search unavailable or failed)
+        return results
+    
+    @staticmethod
+    def _decode_cached(cached: Optional[str]) -> Optional[Tuple[str, List[Dict[str, Any]]]]:
+        """Unpack a semantic cache entry into (content, tool results)"""
+        if cached is None:
+            return None
+        try:
+            entry = orjson.loads(cached)
+            return entry["content"], entry["results"]
+        except (orjson.JSONDecodeError, KeyError, TypeError):
+            return None
+    
+    def _build_result(self, content: str, tool_results: List[Dict[str, Any]]) -> ResearchResult:
+        """Combine the agent's presentation with the sources from the tool's structured results"""
+        sources = self._extract_sources(tool_results)
+        
+        logger.debug("🔍 EXTRACTED SOURCES: %d", len(sources))
         
         return ResearchResult(
-            content=result.final_output,
+            content=content,
             sources=sources,
             confidence_level="high",
             conflicts_noted=[],
             quality_score=0.85
         )
     
-    def _extract_sources(self, content: str) -> List[Citation]:
-        """Extract sources from search results with quality assessment"""
-        sources = []
-        lines = content.split('\n')
-        
-        for i, line in enumerate(lines):
-            # Look for lines with URLs (both old and new format)
-            if 'http' in line:
-                try:
-                    # Handle new user-friendly format: *Source: http://...*
-                    if '*Source:' in line:
-                        url = line.split('*Source:')[1].strip().rstrip('*')
-                        # Find the title from the previous lines
-                        title = "Unknown Title"
-                        for j in range(max(0, i-3), i):
-                            if lines[j].startswith('**') and lines[j].endswith('**'):
-                                title = lines[j].strip('*')
-                                break
-                            # Also check for numbered titles like "**1. Title**"
-                            elif '**' in lines[j] and any(char.isdigit() for char in lines[j]):
-                                title = lines[j].strip('*').strip()
-                                # Remove numbering if present
-                                if title and title[0].isdigit() and '. ' in title:
-                                    title = title.split('. ', 1)[1]
-                                break
-                    
-                    # Handle old format: [title] content - http://...
-                    elif '[' in line and ']' in line:
-                        title = line.split('[')[1].split(']')[0]
-                        url = line.split('http')[1].split(' ')[0]
-                        if not url.startswith('http'):
-                            url = 'http' + url
-                    
-                    # Handle any other URL format
-                    else:
-                        # Extract URL
-                        url_start = line.find('http')
-                        if url_start != -1:
-                            url = line[url_start:].split(' ')[0].split('\n')[0]
-                            # Try to find title from context
-                            title = "Search Result"
-                            for j in range(max(0, i-2), i):
-                                if lines[j].strip() and not lines[j].startswith('*'):
-                                    title = lines[j].strip()
-                                    break
-                    
-                    # Clean up URL
-                    if not url.startswith('http'):
-                        url = 'http' + url
-                    
-                    # Assess source quality
-                    quality_score = self._assess_source_quality(url, title)
-                    source_type = self._determine_source_type(url)
-                    
-                    sources.append(Citation(
-                        id=len(sources)+1,
-                        title=title,
-                        url=url,
-                        source_type=source_type,
-                        reliability_score=0.8,
-                        quality_score=quality_score
-                    ))
-                except Exception as e:
-                    print(f"Error extracting source from line: {line[:50]}... Error: {e}")
-                    continue
-        
-        return sources
+    def _remember(self, key: str, result: ResearchResult):
+        """Store a result in the exact-match cache, evicting the least recently used entry"""
+        self._exact_cache[key] = (time.time() + self._cache_ttl, result)
+        self._exact_cache.move_to_end(key)
+        if len(self._exact_cache) > self._exact_capacity:
+            self._exact_cache.popitem(last=False)
     
-    def _assess_source_quality(self, url: str, title: str) -> float:
+    def _extract_sources(self, tool_results: List[Dict[str, Any]]) -> List[Citation]:
+        """Build citations from structured search results with quality assessment"""
+        # url -> title; a URL returned by several tool calls is scored and cited once
+        found: Dict[str, str] = {}
+        for item in tool_results:
+            url = str(item.get("url", ""))
+            if url.startswith("http") and url not in found:
+                found[url] = item.get("title") or "Untitled"
+        
+        # Assess the whole batch, classifying each URL's domain once for both type and quality
+        source_types = [self._determine_source_type(url) for url in found]
+        return [
+            Citation(
+                id=i,
+                title=title,
+                url=url,
+                source_type=source_type,
+                reliability_score=0.8,
+                quality_score=self._assess_source_quality(url, title, source_type)
+            )
+            for i, ((url, title), source_type) in enumerate(zip(found.items(), source_types), 1)
+        ]
+    
+    def _assess_source_quality(self, url: str, title: str, source_type: Optional[str] = None) -> float:
         """Assess the quality of a source based on URL and title"""
-        quality_score = 0.5  # Base score
-        
-        # URL-based quality assessment
-        if '.edu' in url or '.ac.' in url:
-            quality_score += 0.3  # Academic sources
-        elif '.gov' in url:
-            quality_score += 0.25  # Government sources
-        elif '.org' in url:
-            quality_score += 0.15  # Organization sources
-        elif '.com' in url:
-            quality_score += 0.05  # Commercial sources
-        else:
-            quality_score -= 0.1  # Unknown domains
-        
-        # Title-based quality assessment
-        title_lower = title.lower()
-        if any(word in title_lower for word in ['study', 'research', 'analysis', 'report', 'journal']):
-            quality_score += 0.2
-        elif any(word in title_lower for word in ['news', 'article', 'blog']):
-            quality_score += 0.1
-        elif any(word in title_lower for word in ['opinion', 'editorial', 'commentary']):
-            quality_score -= 0.1
-        
-        # Ensure score is between 0 and 1
-        return max(0.0, min(1.0, quality_score))
+        return assess_source_quality(url, title, source_type)
     
     def _determine_source_type(self, url: str) -> str:
         """Determine the type of source based on URL"""
-        if '.edu' in url or '.ac.' in url:
-            return "academic"
-        elif '.gov' in url:
-            return "government"
-        elif '.org' in url:
-            return "organization"
-        elif '.com' in url:
-            return "commercial"
-        else:
-            return "web"
+        return classify_source(url)
     
 
+# JSON array in a model reply, possibly wrapped in prose or a code fence
+_JSON_ARRAY_RE = re.compile(r"\[.*\]", re.DOTALL)
+
+async def streamed_run(agent: Agent, prompt: str, on_line: Callable[[str], Awaitable[Any]]) -> Any:
+    """Run an agent uncached, passing each completed line of its answer to on_line as it is generated"""
+    await GEMINI_BUCKET.acquire()
+    async with GEMINI_CONCURRENCY:
+        result = Runner.run_streamed(agent, prompt)
+        
+        # Deltas split lines arbitrarily, so hold back the unfinished tail until its newline arrives
+        pending = ""
+        async for event in result.stream_events():
+            if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+                *lines, pending = (pending + event.data.delta).split("\n")
+                for line in lines:
+                    await on_line(line)
+    if pending:
+        await on_line(pending)
+    
+    return result.final_output
+
 class ReflectionAgent:
     """Specialist agent for analysis and reflection"""
     
@@ -559,9 +797,9 @@ class ReflectionAgent:
             model=self.model
         )
     
-    async def reflect(self, content: str, context: str = "") -> ResearchResult:
-        """Analyze and reflect on research content"""
-        print(f"🤔 REFLECTION AGENT: Analyzing findings")
+    async def reflect(self, content: str, context: str = "", on_line=None) -> ResearchResult:
+        """Analyze and reflect on research content, passing each line of the analysis to on_line as it streams in"""
+        logger.info("🤔 REFLECTION AGENT: Analyzing findings")
         
         reflection_prompt = f"""
         Please analyze this research information and explain it in a helpful way:
@@ -580,35 +818,85 @@ class ReflectionAgent:
         Write this in clear, easy-to-understand language that regular people can follow.
         """
         
-        result = await Runner.run(self.agent, reflection_prompt)
+        if on_line is not None:
+            return self._reflection_result(await streamed_run(self.agent, reflection_prompt, on_line))
+        
+        await GEMINI_BUCKET.acquire()
+        async with GEMINI_CONCURRENCY:
+            result = await Runner.run(self.agent, reflection_prompt)
+        
+        return self._reflection_result(result.final_output)
+    
+    async def reflect_batch(self, chunks: Sequence[Tuple[str, str]], on_line=None) -> List[ResearchResult]:
+        """Analyze several (content, context) pairs in one LLM call, in order (only a single pair is streamed to on_line)"""
+        if len(chunks) == 1:
+            return [await self.reflect(*chunks[0], on_line=on_line)]
+        
+        logger.info("🤔 REFLECTION AGENT: Analyzing %d findings in one batch", len(chunks))
+        
+        sections = "\n\n".join(
+            f"Section {i}:\nResearch Content: {content}\nContext: {context}"
+            for i, (content, context) in enumerate(chunks, 1)
+        )
+        reflection_prompt = f"""
+        Please analyze each of the following {len(chunks)} sections of research information independently
+        and explain it in a helpful way:
+        
+        {sections}
+        
+        For each section, please provide:
+        1. What are the main findings and what do they mean?
+        2. How reliable and trustworthy is this information?
+        3. Are there any conflicting or contradictory points?
+        4. How confident can we be in these findings?
+        5. What should users know or do next?
+        
+        Write each analysis in clear, easy-to-understand language that regular people can follow.
+        Return only a JSON array with one {{"section", "confidence_level", "content"}} object per section, in order,
+        where "content" is the written analysis and "confidence_level" is high, medium or low.
+        """
+        
+        await GEMINI_BUCKET.acquire()
+        async with GEMINI_CONCURRENCY:
+            result = await Runner.run(self.agent, reflection_prompt)
+        
+        analyses = self._parse_batch_analyses(result.final_output, len(chunks))
+        if analyses is None:
+            # One unusable batched answer costs a call per section rather than the whole batch
+            logger.warning("⚠️  Could not parse batched reflection, analyzing %d sections separately", len(chunks))
+            return list(await asyncio.gather(*(self.reflect(content, context) for content, context in chunks)))
         
+        return [self._reflection_result(content, confidence_level) for content, confidence_level in analyses]
+    
+    def _parse_batch_analyses(self, output: str, expected: int) -> Optional[List[Tuple[str, str]]]:
+        """Return (content, confidence_level) per section from the model's JSON array, or None if unusable"""
+        match = _JSON_ARRAY_RE.search(output or "")
+        if not match:
+            return None
+        try:
+            entries = orjson.loads(match.group(0))
+        except orjson.JSONDecodeError:
+            return None
+        if len(entries) != expected or not all(isinstance(entry, dict) and isinstance(entry.get("content"), str) for entry in entries):
+            return None
+        return [
+            (entry["content"], str(entry.get("confidence_level") or "high").lower())
+            for entry in entries
+        ]
+    
+    def _reflection_result(self, content: str, confidence_level: str = "high") -> ResearchResult:
+        """Wrap an analysis in a research result with its detected conflicts"""
         return ResearchResult(
-            content=result.final_output,
+            content=content,
             sources=[],
-            confidence_level="high",
-            conflicts_noted=self._extract_conflicts(result.final_output),
+            confidence_level=confidence_level,
+            conflicts_noted=self._extract_conflicts(content),
             quality_score=0.9
         )
     
     def _extract_conflicts(self, content: str) -> List[str]:
         """Extract conflicts from reflection content with advanced analysis"""
-        conflicts = []
-        lines = content.split('\n')
-        
-        # Look for various conflict indicators
-        conflict_keywords = [
-            'conflict', 'contradiction', 'disagreement', 'opposing', 'differing',
-            'contrary', 'inconsistent', 'divergent', 'clashing', 'conflicting',
-            'however', 'but', 'although', 'despite', 'whereas', 'while',
-            'on the other hand', 'in contrast', 'alternatively'
-        ]
-        
-        for line in lines:
-            line_lower = line.lower()
-            if any(keyword in line_lower for keyword in conflict_keywords):
-                conflicts.append(line.strip())
-        
-        return conflicts
+        return extract_conflicts(content)
     
     def _resolve_conflicts(self, conflicts: List[str], search_results: List[ResearchResult]) -> Dict[str, Any]:
         """Advanced conflict resolution strategy"""
@@ -619,18 +907,11 @@ class ReflectionAgent:
         conflict_types = self._categorize_conflicts(conflicts)
         
         # Apply resolution strategies
-        resolution_strategies = {
-            "temporal": self._resolve_temporal_conflicts,
-            "methodological": self._resolve_methodological_conflicts,
-            "perspectival": self._resolve_perspectival_conflicts,
-            "data_quality": self._resolve_data_quality_conflicts
-        }
-        
-        resolutions = []
-        for conflict_type, conflicts_list in conflict_types.items():
-            if conflict_type in resolution_strategies:
-                resolution = resolution_strategies[conflict_type](conflicts_list, search_results)
-                resolutions.append(resolution)
+        resolutions = [
+            _CONFLICT_RESOLUTIONS[conflict_type]
+            for conflict_type in conflict_types
+            if conflict_type in _CONFLICT_RESOLUTIONS
+        ]
         
         # Synthesize final resolution
         final_resolution = self._synthesize_resolutions(resolutions)
@@ -639,66 +920,14 @@ class ReflectionAgent:
     
     def _categorize_conflicts(self, conflicts: List[str]) -> Dict[str, List[str]]:
         """Categorize conflicts by type"""
-        categories = {
-            "temporal": [],
-            "methodological": [],
-            "perspectival": [],
-            "data_quality": []
-        }
+        categories: Dict[str, List[str]] = {category: [] for category in CONFLICT_CATEGORIES}
         
         for conflict in conflicts:
-            conflict_lower = conflict.lower()
-            
-            if any(word in conflict_lower for word in ['recent', 'latest', 'new', 'old', 'dated', 'current']):
-                categories["temporal"].append(conflict)
-            elif any(word in conflict_lower for word in ['method', 'approach', 'study', 'research', 'analysis']):
-                categories["methodological"].append(conflict)
-            elif any(word in conflict_lower for word in ['perspective', 'view', 'opinion', 'belief', 'stance']):
-                categories["perspectival"].append(conflict)
-            elif any(word in conflict_lower for word in ['quality', 'reliable', 'accurate', 'valid', 'credible']):
-                categories["data_quality"].append(conflict)
-            else:
-                categories["perspectival"].append(conflict)  # Default category
+            categories[categorize_conflict(conflict)].append(conflict)
         
         return {k: v for k, v in categories.items() if v}  # Remove empty categories
     
-    def _resolve_temporal_conflicts(self, conflicts: List[str], search_results: List[ResearchResult]) -> Dict[str, Any]:
-        """Resolve conflicts related to timing and recency"""
-        return {
-            "type": "temporal",
-            "strategy": "prioritize_recent_sources",
-            "resolution": "Prioritizing more recent sources and noting temporal context",
-            "confidence": 0.8
-        }
-    
-    def _resolve_methodological_conflicts(self, conflicts: List[str], search_results: List[ResearchResult]) -> Dict[str, Any]:
-        """Resolve conflicts related to different methodologies"""
-        return {
-            "type": "methodological",
-            "strategy": "compare_methodologies",
-            "resolution": "Comparing different methodological approaches and noting their respective strengths",
-            "confidence": 0.7
-        }
-    
-    def _resolve_perspectival_conflicts(self, conflicts: List[str], search_results: List[ResearchResult]) -> Dict[str, Any]:
-        """Resolve conflicts related to different perspectives"""
-        return {
-            "type": "perspectival",
-            "strategy": "acknowledge_multiple_perspectives",
-            "resolution": "Acknowledging multiple valid perspectives and providing balanced analysis",
-            "confidence": 0.9
-        }
-    
-    def _resolve_data_quality_conflicts(self, conflicts: List[str], search_results: List[ResearchResult]) -> Dict[str, Any]:
-        """Resolve conflicts related to data quality"""
-        return {
-            "type": "data_quality",
-            "strategy": "assess_source_reliability",
-            "resolution": "Assessing source reliability and prioritizing higher-quality sources",
-            "confidence": 0.8
-        }
-    
-    def _synthesize_resolutions(self, resolutions: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _synthesize_resolutions(self, resolutions: List[Mapping[str, Any]]) -> Dict[str, Any]:
         """Synthesize multiple conflict resolutions into a final resolution"""
         if not resolutions:
             return {"resolution": "No conflicts to resolve", "confidence": 1.0}
@@ -706,14 +935,14 @@ class ReflectionAgent:
         # Calculate average confidence
         avg_confidence = sum(r.get("confidence", 0) for r in resolutions) / len(resolutions)
         
-        # Combine resolution strategies
-        strategies = [r.get("strategy", "") for r in resolutions]
-        resolution_text = "Multiple conflict resolution strategies applied: " + ", ".join(set(strategies))
+        # Combine resolution strategies (deduplicated once, in the order they were applied)
+        strategies = dict.fromkeys(r.get("strategy", "") for r in resolutions)
+        resolution_text = "Multiple conflict resolution strategies applied: " + ", ".join(strategies)
         
         return {
             "resolution": resolution_text,
             "confidence": avg_confidence,
-            "strategies_applied": len(set(strategies))
+            "strategies_applied": len(strategies)
         }
 
 class CitationsAgent:
@@ -741,26 +970,73 @@ class CitationsAgent:
             model=self.model
         )
     
-    async def create_citations(self, sources: List[Citation], style: str = "APA") -> List[Citation]:
-        """Create properly formatted citations"""
-        print(f"📚 CITATIONS AGENT: Creating {style} citations")
+    async def create_citations(self, sources: Sequence[Citation]) -> List[Citation]:
+        """Fill in citation metadata; only sources missing author/date need the LLM (one batched call)"""
+        logger.info("📚 CITATIONS AGENT: Creating citations")
+        
+        # Citations are formatted from templates (Citation.format) when the report is rendered,
+        # so complete ones need no LLM call
+        missing = [citation for citation in sources if not citation.has_metadata]
+        if not missing:
+            return list(sources)
         
+        source_lines = "\n".join(f"{s.id}. {s.title} - {s.url}" for s in missing)
         citations_prompt = f"""
-        Create properly formatted {style} citations for these sources:
+        Find the author and publication year for these sources:
         
-        Sources: {[f"{s.title} - {s.url}" for s in sources]}
+        {source_lines}
         
-        Please format each citation according to {style} standards and ensure all information is complete and accurate.
+        Return only a JSON array of {{"id", "author", "year"}} objects, one per input source, in order.
+        Use null when the author or year cannot be determined.
         """
         
-        result = await Runner.run(self.agent, citations_prompt)
+        await GEMINI_BUCKET.acquire()
+        async with GEMINI_CONCURRENCY:
+            result = await Runner.run(self.agent, citations_prompt)
+        details = self._parse_citation_details(result.final_output)
+        
+        # Fan the batched answer back into the sources (citations are frozen, so build new ones);
+        # unknown details stay None so the citation template renders "Unknown" / "n.d."
+        return [
+            citation if citation.has_metadata else replace(
+                citation,
+                author=citation.author or self._detail(details, citation.id, "author"),
+                publication_date=citation.publication_date or self._detail(details, citation.id, "year")
+            )
+            for citation in sources
+        ]
+    
+    async def create_citations_many(self, batches: List[List[Citation]], concurrency: int = 8) -> List[List[Citation]]:
+        """Create citations for several source batches concurrently, one LLM call per batch"""
+        semaphore = asyncio.Semaphore(concurrency)
         
-        # Enhance existing citations with proper formatting
-        for citation in sources:
-            citation.author = "Unknown"  # Would be extracted from source
-            citation.publication_date = "2024"  # Would be extracted from source
+        async def run_batch(batch: List[Citation]) -> List[Citation]:
+            async with semaphore:
+                return await self.create_citations(batch)
         
-        return sources
+        return list(await asyncio.gather(*(run_batch(batch) for batch in batches)))
+    
+    @staticmethod
+    def _detail(details: Dict[int, Dict[str, Any]], citation_id: int, name: str) -> Optional[str]:
+        """One citation detail from the model, or None when it could not be determined"""
+        value = details.get(citation_id, {}).get(name)
+        return str(value) if value is not None and str(value).strip() else None
+    
+    def _parse_citation_details(self, output: str) -> Dict[int, Dict[str, Any]]:
+        """Map source id -> citation details from the model's JSON array (empty if unparseable)"""
+        match = _JSON_ARRAY_RE.search(output or "")
+        if not match:
+            return {}
+        try:
+            entries = orjson.loads(match.group(0))
+        except orjson.JSONDecodeError:
+            logger.warning("⚠️  Could not parse citation details from the citations agent")
+            return {}
+        return {
+            entry["id"]: entry
+            for entry in entries
+            if isinstance(entry, dict) and isinstance(entry.get("id"), int)
+        }
 
 # ============================================================================
 # LEAD RESEARCH AGENT (ORCHESTRATOR)
@@ -769,7 +1045,11 @@ class CitationsAgent:
 class LeadResearchAgent:
     """Main orchestrator that coordinates all research agents"""
     
-    def __init__(self):
+    def __init__(self, citation_style: str = "APA"):
+        init_environment()
+        if citation_style.upper() not in CITATION_TEMPLATES:
+            raise ValueError(f"Unknown citation style {citation_style!r} (expected one of {', '.join(CITATION_TEMPLATES)})")
+        self.citation_style = citation_style.upper()  # Style of the report's source list
         self.client = None
         self.model = None
         self.requirement_agent = None
@@ -777,110 +1057,95 @@ class LeadResearchAgent:
         self.search_agent = None
         self.reflection_agent = None
         self.citations_agent = None
-        self.last_api_call = 0
-        self.rate_limit_delay = 7  # 7 seconds between calls
-        self.execution_trace = []  # Enhanced tracing
-        self.performance_metrics = {}  # Performance tracking
+        # Token bucket: bursts of up to 5 agent handoffs, refilled at one per 7 seconds
+        self.rate_limiter = AsyncTokenBucket(rate=1 / 7, capacity=5)
+        self.execution_trace: "deque[TraceEntry]" = deque(maxlen=1024)  # Enhanced tracing (most recent operations only)
+        self.trace_enabled = os.getenv("TRACE_ENABLED", "1").lower() not in ("0", "false", "no")
+        self._total_ops = 0
+        self._successful_ops = 0
+        self._handoff_count = 0
+        self.performance_metrics: Dict[str, AgentMetrics] = {}  # Performance tracking
         self.setup_llm()
         self.setup_agents()
     
     async def _rate_limit(self):
-        """Ensure we don't exceed API rate limits"""
-        import time
-        current_time = time.time()
-        time_since_last_call = current_time - self.last_api_call
-        
-        if time_since_last_call < self.rate_limit_delay:
-            sleep_time = self.rate_limit_delay - time_since_last_call
-            print(f"⏳ Rate limiting: waiting {sleep_time:.1f} seconds...")
-            await asyncio.sleep(sleep_time)
-        
-        self.last_api_call = time.time()
-    
-    def _log_execution(self, agent_name: str, action: str, duration: float = None, success: bool = True, details: str = ""):
-        """Log agent execution for tracing and monitoring"""
-        import time
-        log_entry = {
-            "timestamp": time.time(),
-            "agent": agent_name,
-            "action": action,
-            "duration": duration,
-            "success": success,
-            "details": details
-        }
-        self.execution_trace.append(log_entry)
+        """Ensure we don't exceed API rate limits (bursts of independent calls run together)"""
+        await self.rate_limiter.acquire()
+    
+    def _log_execution(self, agent_name: str, action: str, details_fmt: str = "", *details_args: Any,
+                       duration: float = None, success: bool = True):
+        """Log agent execution for tracing and monitoring (details are %-formatted lazily, like logging)"""
+        if self.trace_enabled:
+            self.execution_trace.append(
+                TraceEntry(time.time(), agent_name, action, duration, success, details_fmt, details_args)
+            )
+        
+        self._total_ops += 1
+        if success:
+            self._successful_ops += 1
+        if action.startswith("handoff_"):
+            self._handoff_count += 1
+        
+        run = _run_counters.get()
+        if run is not None:
+            run.total_ops += 1
+            if success:
+                run.successful_ops += 1
+            if action.startswith("handoff_"):
+                run.handoff_count += 1
         
         # Update performance metrics
-        if agent_name not in self.performance_metrics:
-            self.performance_metrics[agent_name] = {
-                "total_calls": 0,
-                "successful_calls": 0,
-                "total_duration": 0,
-                "average_duration": 0
-            }
-        
-        self.performance_metrics[agent_name]["total_calls"] += 1
+        metrics = self.performance_metrics.get(agent_name)
+        if metrics is None:
+            metrics = self.performance_metrics[agent_name] = AgentMetrics()
+        
+        metrics.total_calls += 1
         if success:
-            self.performance_metrics[agent_name]["successful_calls"] += 1
+            metrics.successful_calls += 1
         if duration:
-            self.performance_metrics[agent_name]["total_duration"] += duration
-            self.performance_metrics[agent_name]["average_duration"] = (
-                self.performance_metrics[agent_name]["total_duration"] / 
-                self.performance_metrics[agent_name]["total_calls"]
-            )
+            metrics.total_duration += duration
     
     def get_execution_summary(self) -> Dict[str, Any]:
         """Get a summary of execution trace and performance metrics"""
         return {
-            "total_operations": len(self.execution_trace),
-            "execution_trace": self.execution_trace[-10:],  # Last 10 operations
-            "performance_metrics": self.performance_metrics,
+            "total_operations": self._total_ops,
+            "handoff_count": self._handoff_count,
+            "execution_trace": [  # Last 10 operations
+                entry.to_dict()
+                for entry in itertools.islice(self.execution_trace, max(0, len(self.execution_trace) - 10), None)
+            ],
+            "performance_metrics": {agent: metrics.to_dict() for agent, metrics in self.performance_metrics.items()},
             "success_rate": self._calculate_success_rate()
         }
     
     def _calculate_success_rate(self) -> float:
         """Calculate overall success rate across all agents"""
-        if not self.execution_trace:
-            return 0.0
-        
-        successful = sum(1 for entry in self.execution_trace if entry.get("success", False))
-        total = len(self.execution_trace)
-        return successful / total if total > 0 else 0.0
+        return self._successful_ops / self._total_ops if self._total_ops else 0.0
     
-    async def _retry_with_backoff(self, func, max_retries=3, base_delay=5):
-        """Retry function with exponential backoff for API errors"""
+    async def _retry_with_backoff(self, func, max_retries=3, base_delay=5, max_delay=60):
+        """Retry function with full-jitter exponential backoff for API errors"""
         for attempt in range(max_retries):
             try:
                 return await func()
             except Exception as e:
-                if "500" in str(e) or "INTERNAL" in str(e) or "429" in str(e):
-                    if attempt < max_retries - 1:
-                        delay = base_delay * (2 ** attempt)
-                        print(f"⚠️  API error (attempt {attempt + 1}/{max_retries}): {e}")
-                        print(f"⏳ Retrying in {delay} seconds...")
-                        await asyncio.sleep(delay)
-                        continue
+                if _is_retryable(e) and attempt < max_retries - 1:
+                    # Full jitter: a random wait up to the exponential cap, so gathered siblings
+                    # that failed together do not all retry at the same instant
+                    delay = random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+                    logger.warning("⚠️  API error (attempt %d/%d): %s", attempt + 1, max_retries, e)
+                    logger.warning("⏳ Retrying in %.1f seconds...", delay)
+                    await asyncio.sleep(delay)
+                    continue
                 raise e
         raise Exception(f"Failed after {max_retries} attempts")
     
     def setup_llm(self):
         """Setup the language model"""
-        gemini_key = os.getenv("GEMINI_API_KEY")
-        
-        if not gemini_key:
-            raise ValueError("GEMINI_API_KEY not found. Please set your Gemini API key.")
-        
-        self.client = AsyncOpenAI(
-            api_key=gemini_key,
-            base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-        )
+        # Instances created on the same event loop share one client, connection pool and model
+        self.client = get_client()
+        self.model = get_model(self.client)
         
-        self.model = OpenAIChatCompletionsModel(
-            model="gemini-2.5-flash",
-            openai_client=self.client
-        )
-        
-        print("🔧 Using Gemini model")
+        logger.info("🔧 Using Gemini model")
     
     def setup_agents(self):
         """Initialize all specialist agents"""
@@ -890,39 +1155,38 @@ class LeadResearchAgent:
         self.reflection_agent = ReflectionAgent(self.client, self.model)
         self.citations_agent = CitationsAgent(self.client, self.model)
     
-    async def _rate_limit(self):
-        """Ensure we don't exceed API rate limits"""
-        import time
-        current_time = time.time()
-        time_since_last_call = current_time - self.last_api_call
-        
-        if time_since_last_call < self.rate_limit_delay:
-            sleep_time = self.rate_limit_delay - time_since_last_call
-            print(f"⏳ Rate limiting: waiting {sleep_time:.1f} seconds...")
-            await asyncio.sleep(sleep_time)
-        
-        self.last_api_call = time.time()
+    async def aclose(self):
+        """Release pooled HTTP connections held by the specialist agents"""
+        await self.search_agent.aclose()
     
     async def conduct_research(self, user_input: str, stream_callback=None) -> str:
         """Main research orchestration following the flowchart with streaming support"""
+        # Count this call's operations apart from other sessions sharing this instance
+        token = _run_counters.set(RunCounters())
+        try:
+            return await self._conduct_research(user_input, stream_callback)
+        finally:
+            _run_counters.reset(token)
+    
+    async def _conduct_research(self, user_input: str, stream_callback=None) -> str:
+        """Run the research steps, reporting the operations counted for this call"""
         if stream_callback:
             await stream_callback("🚀 **LEAD RESEARCH AGENT (ORCHESTRATOR)**\n" + "=" * 60)
         
-        print("🚀 LEAD RESEARCH AGENT (ORCHESTRATOR)")
-        print("=" * 60)
+        logger.info("🚀 LEAD RESEARCH AGENT (ORCHESTRATOR)")
         
         # Step 1: Requirement Gathering
         if stream_callback:
             await stream_callback("\n🔍 **STEP 1: REQUIREMENT GATHERING**\n" + "=" * 50)
-        print("\n🔍 STEP 1: REQUIREMENT GATHERING")
+        logger.info("🔍 STEP 1: REQUIREMENT GATHERING")
         
         # Log handoff to Requirement Gathering Agent
-        self._log_execution("LeadResearchAgent", "handoff_to_requirement_gathering", success=True, details="Handing off to Requirement Gathering Agent")
+        self._log_execution("LeadResearchAgent", "handoff_to_requirement_gathering", "Handing off to Requirement Gathering Agent")
         
         requirements = await self.requirement_agent.gather_requirements(user_input, stream_callback)
         
         # Log handoff back from Requirement Gathering Agent
-        self._log_execution("RequirementGatheringAgent", "handoff_back_to_lead", success=True, details=f"Gathered requirements: {requirements.clarified_question}")
+        self._log_execution("RequirementGatheringAgent", "handoff_back_to_lead", "Gathered requirements: %s", requirements.clarified_question)
         
         if stream_callback:
             await stream_callback(f"✅ **Requirements gathered:** {requirements.clarified_question}\n📊 **Research depth:** {requirements.research_depth}\n")
@@ -930,15 +1194,15 @@ class LeadResearchAgent:
         # Step 2: Planning
         if stream_callback:
             await stream_callback("\n📋 **STEP 2: PLANNING**\n" + "=" * 50)
-        print("\n📋 STEP 2: PLANNING")
+        logger.info("📋 STEP 2: PLANNING")
         
         # Log handoff to Planning Agent
-        self._log_execution("LeadResearchAgent", "handoff_to_planning", success=True, details="Handing off to Planning Agent")
+        self._log_execution("LeadResearchAgent", "handoff_to_planning", "Handing off to Planning Agent")
         
         plan = await self.planning_agent.create_plan(requirements, stream_callback)
         
         # Log handoff back from Planning Agent
-        self._log_execution("PlanningAgent", "handoff_back_to_lead", success=True, details=f"Created plan with {len(plan.tasks)} tasks")
+        self._log_execution("PlanningAgent", "handoff_back_to_lead", "Created plan with %d tasks", len(plan.tasks))
         
         if stream_callback:
             await stream_callback(f"✅ **Plan created:** {len(plan.tasks)} tasks\n⏱️ **Estimated duration:** {plan.estimated_duration}\n")
@@ -946,47 +1210,59 @@ class LeadResearchAgent:
         # Step 3: Research Execution (Orchestrator coordinates specialist agents)
         if stream_callback:
             await stream_callback("\n🔬 **STEP 3: RESEARCH EXECUTION**\n" + "=" * 50)
-        print("\n🔬 STEP 3: RESEARCH EXECUTION")
+        logger.info("🔬 STEP 3: RESEARCH EXECUTION")
         
         # Log handoff to Research Execution
-        self._log_execution("LeadResearchAgent", "handoff_to_research_execution", success=True, details="Handing off to Research Execution phase")
+        self._log_execution("LeadResearchAgent", "handoff_to_research_execution", "Handing off to Research Execution phase")
         
         research_results = await self._execute_research_plan(plan, requirements, stream_callback)
         
         # Log handoff back from Research Execution
-        self._log_execution("ResearchExecution", "handoff_back_to_lead", success=True, details=f"Completed research with {len(research_results.get('search_results', []))} search results")
+        self._log_execution("ResearchExecution", "handoff_back_to_lead", "Completed research with %d search results", len(research_results.get('search_results', [])))
         
         # Step 4: Final Synthesis
         if stream_callback:
             await stream_callback("\n📝 **STEP 4: FINAL SYNTHESIS**")
-        print("\n📝 STEP 4: FINAL SYNTHESIS")
+        logger.info("📝 STEP 4: FINAL SYNTHESIS")
         final_report = await self._create_final_report(requirements, research_results)
         
-        # Add execution summary to the report
+        # Add execution summary to the report (collected as lines and joined once); operation and
+        # handoff totals cover this call only, the per-agent metrics cover every call so far
         execution_summary = self.get_execution_summary()
-        final_report += f"\n\n## 🔍 **Execution Summary**\n\n"
-        final_report += f"**Total Operations:** {execution_summary['total_operations']}\n"
-        final_report += f"**Success Rate:** {execution_summary['success_rate']:.1%}\n"
-        final_report += f"**Performance Metrics:**\n"
+        run = _run_counters.get()
+        summary_lines = [
+            final_report,
+            "",
+            "## 🔍 **Execution Summary**",
+            "",
+            f"**Total Operations:** {run.total_ops}",
+            f"**Success Rate:** {run.success_rate:.1%}",
+            "**Performance Metrics:**",
+        ]
         
-        for agent, metrics in execution_summary['performance_metrics'].items():
-            final_report += f"- **{agent}:** {metrics['successful_calls']}/{metrics['total_calls']} calls, avg {metrics['average_duration']:.1f}s\n"
+        summary_lines.extend(
+            f"- **{agent}:** {metrics['successful_calls']}/{metrics['total_calls']} calls, avg {metrics['average_duration']:.1f}s"
+            for agent, metrics in execution_summary['performance_metrics'].items()
+        )
         
         # Add handoff summary
-        handoff_events = [entry for entry in execution_summary['execution_trace'] if 'handoff' in entry.get('action', '')]
-        if handoff_events:
-            final_report += f"\n**Handoff Events:** {len(handoff_events)}\n"
-            final_report += f"- **Lead → Requirement Gathering:** ✅\n"
-            final_report += f"- **Lead → Planning:** ✅\n"
-            final_report += f"- **Lead → Search Agents:** ✅\n"
-            final_report += f"- **Lead → Reflection Agents:** ✅\n"
-            final_report += f"- **Lead → Citations Agents:** ✅\n"
+        if run.handoff_count:
+            summary_lines += [
+                "",
+                f"**Handoff Events:** {run.handoff_count}",
+                "- **Lead → Requirement Gathering:** ✅",
+                "- **Lead → Planning:** ✅",
+                "- **Lead → Search Agents:** ✅",
+                "- **Lead → Reflection Agents:** ✅",
+                "- **Lead → Citations Agents:** ✅",
+            ]
+        
+        final_report = "\n".join(summary_lines) + "\n"
         
         if stream_callback:
             await stream_callback("\n✅ **RESEARCH COMPLETE**\n" + "=" * 60)
-            await stream_callback(f"📈 **Success Rate:** {execution_summary['success_rate']:.1%}")
-        print("\n✅ RESEARCH COMPLETE")
-        print("=" * 60)
+            await stream_callback(f"📈 **Success Rate:** {run.success_rate:.1%}")
+        logger.info("✅ RESEARCH COMPLETE")
         
         return final_report
     
@@ -999,157 +1275,290 @@ class LeadResearchAgent:
             "final_content": ""
         }
         
-        # Group tasks by type for parallel execution
-        search_tasks = [task for task in plan.tasks if task['agent'] == 'Search']
-        reflection_tasks = [task for task in plan.tasks if task['agent'] == 'Reflection']
-        citation_tasks = [task for task in plan.tasks if task['agent'] == 'Citations']
+        # Group tasks by type for parallel execution (one pass over the plan)
+        task_groups: Dict[str, List[Dict[str, Any]]] = {'Search': [], 'Reflection': [], 'Citations': []}
+        for task in plan.tasks:
+            group = task_groups.get(task['agent'])
+            if group is not None:
+                group.append(task)
+        search_tasks, reflection_tasks, citation_tasks = task_groups['Search'], task_groups['Reflection'], task_groups['Citations']
+        
+        # Each search is queued as (task id, result) as soon as it finishes, so a reflection task
+        # starts once the searches it depends on are done instead of waiting for the slowest search
+        results_q: asyncio.Queue = asyncio.Queue()
+        
+        # Citation tasks only depend on the search results, so they run alongside the
+        # reflection phase unless a citation task explicitly depends on a reflection task
+        reflection_ids = {task['id'] for task in reflection_tasks}
+        citations_after_reflection = any(
+            dep in reflection_ids for task in citation_tasks for dep in task.get('depends_on', [])
+        )
         
-        # Execute search tasks in parallel with handoffs
-        if search_tasks:
-            if stream_callback:
-                await stream_callback(f"\n🔍 **PARALLEL SEARCH EXECUTION** - {len(search_tasks)} search tasks")
-            
-            search_coroutines = []
-            for i, task in enumerate(search_tasks, 1):
-                task_info = f"\n🎯 **Search Task {i}: {task['description']}**"
+        async def search_then_citations():
+            await self._execute_search_tasks(search_tasks, requirements, results, results_q, stream_callback)
+            if not citations_after_reflection:
+                await self._execute_citation_tasks(citation_tasks, results, stream_callback)
+        
+        await asyncio.gather(
+            search_then_citations(),
+            self._execute_reflection_tasks(
+                reflection_tasks, [task['id'] for task in search_tasks], results_q, results, stream_callback
+            )
+        )
+        
+        if citations_after_reflection:
+            await self._execute_citation_tasks(citation_tasks, results, stream_callback)
+        
+        if stream_callback:
+            await stream_callback(f"\n✅ **PARALLEL EXECUTION COMPLETE** - All tasks finished")
+        
+        return results
+    
+    async def _execute_search_tasks(self, search_tasks: List[Dict[str, Any]], requirements: ResearchRequirement, results: Dict[str, Any], results_q: asyncio.Queue, stream_callback=None):
+        """Execute search tasks in parallel with handoffs, queueing each result as it completes"""
+        try:
+            if search_tasks:
                 if stream_callback:
-                    await stream_callback(task_info)
+                    await stream_callback(f"\n🔍 **PARALLEL SEARCH EXECUTION** - {len(search_tasks)} search tasks")
                 
-                async def search_task_wrapper(task=task, task_num=i):
-                    await self._rate_limit()
-                    # Log handoff to Search Agent
-                    self._log_execution("LeadResearchAgent", f"handoff_to_search_{task_num}", success=True, details=f"Handing off to Search Agent for: {task['description']}")
+                search_coroutines = []
+                for i, task in enumerate(search_tasks, 1):
+                    task_info = f"\n🎯 **Search Task {i}: {task['description']}**"
+                    if stream_callback:
+                        await stream_callback(task_info)
                     
-                    result = await self._retry_with_backoff(
-                        lambda: self.search_agent.search(
-                            requirements.clarified_question,
-                            f"Task: {task['description']}"
-                        )
+                    search_coroutines.append(
+                        self._run_search(task, i, requirements.clarified_question, results, results_q, stream_callback)
                     )
-                    
-                    # Log handoff back from Search Agent
-                    self._log_execution("SearchAgent", f"handoff_back_to_lead_{task_num}", success=True, details=f"Returned {len(result.sources)} sources")
-                    return result
                 
-                search_coroutines.append(search_task_wrapper())
+                # Execute all search tasks in parallel
+                await asyncio.gather(*search_coroutines)
+        finally:
+            # Tell the reflection phase that no more search results are coming
+            results_q.put_nowait(None)
+    
+    async def _run_search(self, task: Dict[str, Any], task_num: int, question: str, results: Dict[str, Any], results_q: asyncio.Queue, stream_callback=None):
+        """Run one search task with handoff logging, recording and queueing its result"""
+        try:
+            await self._rate_limit()
+            # Log handoff to Search Agent
+            self._log_execution("LeadResearchAgent", f"handoff_to_search_{task_num}", "Handing off to Search Agent for: %s", task['description'])
             
-            # Execute all search tasks in parallel
-            search_results = await asyncio.gather(*search_coroutines, return_exceptions=True)
+            result = await self._retry_with_backoff(
+                functools.partial(self.search_agent.search, question, f"Task: {task['description']}")
+            )
             
-            for i, result in enumerate(search_results):
-                if isinstance(result, Exception):
-                    if stream_callback:
-                        await stream_callback(f"   ❌ **Search task {i+1} failed:** {result}")
-                    self._log_execution("SearchAgent", f"search_task_{i+1}_failed", success=False, details=str(result))
-                else:
-                    results["search_results"].append(result)
-                    if stream_callback:
-                        await stream_callback(f"   ✅ **Search task {i+1} completed** - Found {len(result.sources)} sources")
-                    self._log_execution("SearchAgent", f"search_task_{i+1}_completed", success=True, details=f"Found {len(result.sources)} sources")
-        
-        # Execute reflection tasks in parallel with handoffs (after search results are available)
-        if reflection_tasks and results["search_results"]:
+            # Log handoff back from Search Agent
+            self._log_execution("SearchAgent", f"handoff_back_to_lead_{task_num}", "Returned %d sources", len(result.sources))
+        except Exception as e:
             if stream_callback:
+                await stream_callback(f"   ❌ **Search task {task_num} failed:** {e}")
+            self._log_execution("SearchAgent", f"search_task_{task_num}_failed", str(e), success=False)
+            await results_q.put((task['id'], None))
+            return
+        
+        results["search_results"].append(result)
+        if stream_callback:
+            await stream_callback(f"   ✅ **Search task {task_num} completed** - Found {len(result.sources)} sources")
+        self._log_execution("SearchAgent", f"search_task_{task_num}_completed", "Found %d sources", len(result.sources))
+        await results_q.put((task['id'], result))
+    
+    async def _execute_reflection_tasks(self, reflection_tasks: List[Dict[str, Any]], search_ids: List[str], results_q: asyncio.Queue, results: Dict[str, Any], stream_callback=None):
+        """Execute reflection tasks in parallel with handoffs, starting each once the searches it depends on finish"""
+        if not reflection_tasks:
+            return
+        
+        # Each task waits for the searches in its depends_on (every search if it names none)
+        pending_tasks = []
+        for task_num, task in enumerate(reflection_tasks, 1):
+            search_deps = [dep for dep in task.get('depends_on', []) if dep in search_ids] or search_ids
+            pending_tasks.append((task_num, task, search_deps))
+        finished: Dict[str, Optional[ResearchResult]] = {}  # search task id -> result (None if it failed)
+        reflection_jobs = []  # (task numbers, job) - one LLM call per job
+        
+        async def start_reflections(batch):
+            if not reflection_jobs and stream_callback:
                 await stream_callback(f"\n🤔 **PARALLEL REFLECTION EXECUTION** - {len(reflection_tasks)} analysis tasks")
             
-            reflection_coroutines = []
-            for i, task in enumerate(reflection_tasks, 1):
-                task_info = f"\n🎯 **Reflection Task {i}: {task['description']}**"
+            for task_num, task, _ in batch:
+                task_info = f"\n🎯 **Reflection Task {task_num}: {task['description']}**"
                 if stream_callback:
                     await stream_callback(task_info)
-                
-                # Use different search results for different reflection tasks
-                search_content = results["search_results"][i % len(results["search_results"])].content
-                
-                async def reflection_task_wrapper(task=task, content=search_content, task_num=i):
-                    await self._rate_limit()
-                    # Log handoff to Reflection Agent
-                    self._log_execution("LeadResearchAgent", f"handoff_to_reflection_{task_num}", success=True, details=f"Handing off to Reflection Agent for: {task['description']}")
-                    
-                    result = await self._retry_with_backoff(
-                        lambda: self.reflection_agent.reflect(
-                            content,
-                            f"Task: {task['description']}"
-                        )
-                    )
-                    
-                    # Log handoff back from Reflection Agent
-                    self._log_execution("ReflectionAgent", f"handoff_back_to_lead_{task_num}", success=True, details=f"Confidence: {result.confidence_level}")
-                    return result
-                
-                reflection_coroutines.append(reflection_task_wrapper())
             
-            # Execute all reflection tasks in parallel
-            reflection_results = await asyncio.gather(*reflection_coroutines, return_exceptions=True)
+            task_nums = [task_num for task_num, _, _ in batch]
+            reflection_jobs.append((task_nums, asyncio.create_task(self._run_reflection_batch(batch, stream_callback))))
+        
+        # Start reflection tasks as their searches finish; tasks that became ready together share one batched call
+        searches_done = False
+        while pending_tasks and not searches_done:
+            arrived = [await results_q.get()]
+            while not results_q.empty():
+                arrived.append(results_q.get_nowait())
+            for item in arrived:
+                if item is None:
+                    searches_done = True
+                else:
+                    finished[item[0]] = item[1]
             
-            for i, result in enumerate(reflection_results):
-                if isinstance(result, Exception):
+            batch = []
+            for entry in list(pending_tasks):
+                task_num, task, search_deps = entry
+                if searches_done or all(dep in finished for dep in search_deps):
+                    pending_tasks.remove(entry)
+                    # A task whose searches all failed has nothing to analyze and is skipped
+                    contents = [finished[dep].content for dep in search_deps if finished.get(dep) is not None]
+                    if contents:
+                        batch.append((task_num, task, "\n\n".join(contents)))
+            if batch:
+                await start_reflections(batch)
+        
+        # Wait for all reflection tasks to finish
+        job_results = await asyncio.gather(*(job for _, job in reflection_jobs), return_exceptions=True)
+        
+        for (task_nums, _), batch_results in zip(reflection_jobs, job_results):
+            for j, task_num in enumerate(task_nums):
+                if isinstance(batch_results, Exception):
                     if stream_callback:
-                        await stream_callback(f"   ❌ **Reflection task {i+1} failed:** {result}")
-                    self._log_execution("ReflectionAgent", f"reflection_task_{i+1}_failed", success=False, details=str(result))
+                        await stream_callback(f"   ❌ **Reflection task {task_num} failed:** {batch_results}")
+                    self._log_execution("ReflectionAgent", f"reflection_task_{task_num}_failed", str(batch_results), success=False)
                 else:
+                    result = batch_results[j]
                     results["reflection_results"].append(result)
                     if stream_callback:
-                        await stream_callback(f"   ✅ **Reflection task {i+1} completed** - Confidence: {result.confidence_level}")
-                    self._log_execution("ReflectionAgent", f"reflection_task_{i+1}_completed", success=True, details=f"Confidence: {result.confidence_level}")
-        
-        # Execute citation tasks with handoffs (sequential as they depend on all search results)
+                        await stream_callback(f"   ✅ **Reflection task {task_num} completed** - Confidence: {result.confidence_level}")
+                    self._log_execution("ReflectionAgent", f"reflection_task_{task_num}_completed", "Confidence: %s", result.confidence_level)
+    
+    async def _run_reflection_batch(self, batch: List[Tuple[int, Dict[str, Any], str]], stream_callback=None) -> List[ResearchResult]:
+        """Run (task number, task, content) reflection tasks in one batched call with handoff logging"""
+        await self._rate_limit()
+        for task_num, task, _ in batch:
+            # Log handoff to Reflection Agent
+            self._log_execution("LeadResearchAgent", f"handoff_to_reflection_{task_num}", "Handing off to Reflection Agent for: %s", task['description'])
+        
+        # Forward the analysis line by line while it is generated (a batch of several answers in JSON is not streamed)
+        streamed_task = batch[0][0]
+        streamed = False
+        
+        async def stream_line(line: str):
+            nonlocal streamed
+            streamed = streamed or bool(line.strip())
+            await self._stream_quoted(stream_callback, streamed_task, line)
+        
+        on_line = stream_line if stream_callback and len(batch) == 1 else None
+        
+        chunks = [(content, f"Task: {task['description']}") for _, task, content in batch]
+        
+        async def reflect():
+            # A retry streams the analysis again from the start, so mark where the restarted one begins
+            nonlocal streamed
+            if streamed:
+                streamed = False
+                await stream_callback(f"   ↻ **[{streamed_task}]** Analysis interrupted - restarting")
+            return await self.reflection_agent.reflect_batch(chunks, on_line)
+        
+        reflection_results = await self._retry_with_backoff(reflect)
+        
+        for (task_num, _, _), result in zip(batch, reflection_results):
+            # Log handoff back from Reflection Agent
+            self._log_execution("ReflectionAgent", f"handoff_back_to_lead_{task_num}", "Confidence: %s", result.confidence_level)
+        return reflection_results
+    
+    @staticmethod
+    async def _stream_quoted(stream_callback, task_num: int, line: str):
+        """Stream one non-empty line of a task's LLM output as a quote"""
+        if line.strip():
+            await stream_callback(f"   > **[{task_num}]** {line}")
+    
+    async def _execute_citation_tasks(self, citation_tasks: List[Dict[str, Any]], results: Dict[str, Any], stream_callback=None):
+        """Execute citation tasks in parallel with handoffs (they start once all search results are in)"""
         if citation_tasks:
             if stream_callback:
                 await stream_callback(f"\n📚 **CITATION EXECUTION** - {len(citation_tasks)} citation tasks")
             
-            all_sources = []
-            for search_result in results["search_results"]:
-                all_sources.extend(search_result.sources)
+            # Every task reads the same sources; a tuple keeps one task from changing them for the others
+            all_sources = tuple(self._collect_sources(results["search_results"]))
             
             if all_sources:
+                citation_coroutines = []
                 for i, task in enumerate(citation_tasks, 1):
                     task_info = f"\n🎯 **Citation Task {i}: {task['description']}**"
                     if stream_callback:
                         await stream_callback(task_info)
                     
-                    await self._rate_limit()
-                    
-                    # Log handoff to Citations Agent
-                    self._log_execution("LeadResearchAgent", f"handoff_to_citations_{i}", success=True, details=f"Handing off to Citations Agent for: {task['description']}")
-                    
-                    async def citations_task():
-                        return await self.citations_agent.create_citations(all_sources)
+                    citation_coroutines.append(self._run_citation(task, i, all_sources))
+                
+                # Execute all citation tasks in parallel (the rate limiter still paces the LLM calls)
+                citation_results = await asyncio.gather(*citation_coroutines, return_exceptions=True)
+                
+                for i, citations in enumerate(citation_results, 1):
+                    if isinstance(citations, Exception):
+                        if stream_callback:
+                            await stream_callback(f"   ❌ **Citation task {i} failed:** {citations}")
+                        self._log_execution("CitationsAgent", f"citation_task_{i}_failed", str(citations), success=False)
+                        continue
                     
-                    citations = await self._retry_with_backoff(citations_task)
                     results["citations"].extend(citations)
-                    
-                    # Log handoff back from Citations Agent
-                    self._log_execution("CitationsAgent", f"handoff_back_to_lead_{i}", success=True, details=f"Created {len(citations)} citations")
-                    
                     if stream_callback:
                         await stream_callback(f"   ✅ **Citation task {i} completed** - {len(citations)} references formatted")
+    
+    async def _run_citation(self, task: Dict[str, Any], task_num: int, sources: Tuple[Citation, ...]) -> List[Citation]:
+        """Run one citation task over the collected sources with handoff logging"""
+        await self._rate_limit()
+        # Log handoff to Citations Agent
+        self._log_execution("LeadResearchAgent", f"handoff_to_citations_{task_num}", "Handing off to Citations Agent for: %s", task['description'])
+        
+        citations = await self._retry_with_backoff(
+            functools.partial(self.citations_agent.create_citations, sources)
+        )
         
-        if stream_callback:
-            await stream_callback(f"\n✅ **PARALLEL EXECUTION COMPLETE** - All tasks finished")
-        
-        return results
+        # Log handoff back from Citations Agent
+        self._log_execution("CitationsAgent", f"handoff_back_to_lead_{task_num}", "Created %d citations", len(citations))
+        return citations
+    
+    def _collect_sources(self, search_results: List[ResearchResult]) -> List[Citation]:
+        """Gather sources across search results, skipping URLs already seen and renumbering the rest"""
+        seen: Set[str] = set()
+        sources = []
+        for search_result in search_results:
+            for source in search_result.sources:
+                if source.url not in seen:
+                    seen.add(source.url)
+                    sources.append(replace(source, id=len(sources) + 1))
+        return sources
     
     async def _create_final_report(self, requirements: ResearchRequirement, results: Dict[str, Any]) -> str:
         """Create the final research report"""
-        # Combine all search results
-        all_content = []
-        for search_result in results["search_results"]:
-            all_content.append(search_result.content)
+        # Only the first five findings (search results, then reflections) appear in the report,
+        # so take them in one pass instead of copying every result's content into a list
+        top_content = list(itertools.islice(
+            itertools.chain(
+                (search_result.content for search_result in results["search_results"]),
+                (reflection_result.content for reflection_result in results["reflection_results"])
+            ),
+            5
+        ))
         
-        for reflection_result in results["reflection_results"]:
-            all_content.append(reflection_result.content)
+        # Get all sources for citations, preferring the ones formatted by the Citations Agent
+        all_sources = results["citations"] or self._collect_sources(results["search_results"])
         
-        # Get all sources for citations
-        all_sources = []
-        for search_result in results["search_results"]:
-            all_sources.extend(search_result.sources)
+        # Render the list sections up front so the template below is a single formatting pass
+        key_findings = "\n".join(
+            f"• {content[:500]}..." if len(content) > 500 else f"• {content}" for content in top_content
+        )
+        detailed_results = "\n".join(
+            f"### Research Finding {i}\n{content}\n" for i, content in enumerate(top_content[:3], 1)
+        )
+        source_list = "\n".join(
+            f"[{i}] {citation.format(self.citation_style)}" for i, citation in enumerate(all_sources[:10], 1)
+        )
+        timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
+        date_str = timestamp[:10]
         
         # Create final report
         report = f"""
 # Research Report: {requirements.clarified_question}
 
-**Date:** {time.strftime('%Y-%m-%d')}
+**Date:** {date_str}
 **Research Depth:** {requirements.research_depth}
 **Author:** Deep Research Agent System
 
@@ -1163,15 +1572,15 @@ The research was conducted using a multi-agent system with specialized agents fo
 
 ## Key Findings
 
-{chr(10).join([f"• {content[:500]}..." if len(content) > 500 else f"• {content}" for content in all_content[:5]])}
+{key_findings}
 
 ## Detailed Research Results
 
-{chr(10).join([f"### Research Finding {i+1}\n{content}\n" for i, content in enumerate(all_content[:3])])}
+{detailed_results}
 
 ## Sources and Citations
 
-{chr(10).join([f"[{i+1}] {citation.to_apa_format()}" for i, citation in enumerate(all_sources[:10])])}
+{source_list}
 
 ## Research Methodology
 
@@ -1189,7 +1598,7 @@ This research was conducted using:
 
 ---
 
-**Report Generated:** {time.strftime('%Y-%m-%d %H:%M:%S')}
+**Report Generated:** {timestamp}
 """
         
         return report
@@ -1214,23 +1623,32 @@ async def main():
         "Analyze the pros and cons of remote work"
     ]
     
-    for i, question in enumerate(test_questions, 1):
-        print(f"\n🧪 TEST {i}: {question}")
-        print("=" * 60)
+    try:
+        # The questions are independent, so research them concurrently (the shared rate
+        # limiters and concurrency caps still pace the API calls)
+        results = await asyncio.gather(
+            *(system.conduct_research(question) for question in test_questions),
+            return_exceptions=True
+        )
         
-        try:
-            result = await system.conduct_research(question)
+        for i, (question, result) in enumerate(zip(test_questions, results), 1):
+            print(f"\n🧪 TEST {i}: {question}")
+            print("=" * 60)
             
-            print(f"\n📋 FINAL RESULT:")
-            print("-" * 40)
-            print(result[:1000] + "..." if len(result) > 1000 else result)
+            if isinstance(result, Exception):
+                print(f"❌ Error: {result}")
+            else:
+                print("\n📋 FINAL RESULT:")
+                print("-" * 40)
+                print(result[:1000] + "..." if len(result) > 1000 else result)
             
-        except Exception as e:
-            print(f"❌ Error: {e}")
-        
-        print("\n" + "=" * 60)
+            print("\n" + "=" * 60)
+    finally:
+        await system.aclose()
     
     print("\n✅ All tests completed!")
 
 if __name__ == "__main__":
+    init_environment()
+    logging.basicConfig(level=os.getenv("LOG_LEVEL") or "INFO", format="%(message)s")
     asyncio.run(main())
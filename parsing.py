@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Text Analysis Helpers - Keyword matching, source scoring and conflict detection
+Pure, fully annotated functions so the module can optionally be compiled with mypyc (python -m mypyc parsing.py)
+"""
+
+import re
+from typing import Dict, Final, Iterable, List, Optional, Set, Tuple
+
+# ============================================================================
+# KEYWORD MATCHING
+# ============================================================================
+
+def _invert_keywords(buckets: Dict[str, Tuple[str, ...]]) -> Dict[str, Tuple[str, ...]]:
+    """Map each keyword to the buckets it belongs to (a keyword can be in several)"""
+    inverted: Dict[str, Tuple[str, ...]] = {}
+    for bucket, keywords in buckets.items():
+        for keyword in keywords:
+            inverted[keyword] = inverted.get(keyword, ()) + (bucket,)
+    return inverted
+
+def _keyword_scanner(buckets: Dict[str, Tuple[str, ...]]) -> Tuple["re.Pattern[str]", Tuple[Tuple[str, ...], ...]]:
+    """Compile keywords into one case-insensitive pattern reporting every occurrence, plus each group's buckets"""
+    # Zero-width lookahead so overlapping occurrences are found too; longest keywords first.
+    # One capture group per keyword: a match's lastindex identifies its buckets without lowercasing the text
+    keywords = sorted(buckets, key=len, reverse=True)
+    alternation = "|".join(f"({re.escape(keyword)})" for keyword in keywords)
+    group_buckets = ((),) + tuple(buckets[keyword] for keyword in keywords)  # group 0 is unused
+    return re.compile(f"(?=(?:{alternation}))", re.IGNORECASE), group_buckets
+
+def _keyword_pattern(keywords: Iterable[str]) -> "re.Pattern[str]":
+    """Compile keywords into one case-insensitive pattern that matches any of them as a substring"""
+    return re.compile("|".join(re.escape(keyword) for keyword in keywords), re.IGNORECASE)
+
+def _match_buckets(text: str, scanner: "re.Pattern[str]", group_buckets: Tuple[Tuple[str, ...], ...]) -> Set[str]:
+    """Return the keyword buckets whose keywords occur in the text"""
+    return {
+        bucket
+        for match in scanner.finditer(text)
+        for bucket in group_buckets[match.lastindex or 0]
+    }
+
+# Requirement keywords by bucket, matched together in a single pass over the question
+_REQUIREMENT_KEYWORDS: Final = {
+    "deep": ("compare", "analyze", "evaluate", "comprehensive", "detailed"),
+    "expert": (
+        "methodology", "framework", "paradigm", "theoretical", "empirical",
+        "quantitative", "qualitative", "meta-analysis", "systematic review"
+    ),
+    "beginner": ("what is", "define", "explain", "basics", "introduction", "simple"),
+    "focus_technical": ("technical",),
+    "focus_practical": ("practical", "application"),
+    "focus_academic": ("academic", "research"),
+    "detail_high": ("detailed", "comprehensive"),
+    "detail_low": ("brief", "summary"),
+}
+
+_REQUIREMENT_RE, _REQUIREMENT_GROUPS = _keyword_scanner(_invert_keywords(_REQUIREMENT_KEYWORDS))
+
+def match_requirement_keywords(text: str) -> Set[str]:
+    """Return the requirement buckets that occur in the text"""
+    return _match_buckets(text, _REQUIREMENT_RE, _REQUIREMENT_GROUPS)
+
+# ============================================================================
+# SOURCE QUALITY
+# ============================================================================
+
+# URL domain markers (checked in priority order) and title keywords
+_DOMAIN_RE: Final = re.compile(r"\.(edu|ac\.|gov|org|com)")
+_DOMAIN_SOURCE_TYPES: Final = (
+    ("edu", "academic"), ("ac.", "academic"), ("gov", "government"),
+    ("org", "organization"), ("com", "commercial"),
+)
+_SOURCE_TYPE_QUALITY: Final = {
+    "academic": 0.3,
+    "government": 0.25,
+    "organization": 0.15,
+    "commercial": 0.05,
+    "web": -0.1,
+}
+_TITLE_QUALITY_RES: Final = (
+    (_keyword_pattern(("study", "research", "analysis", "report", "journal")), 0.2),
+    (_keyword_pattern(("news", "article", "blog")), 0.1),
+    (_keyword_pattern(("opinion", "editorial", "commentary")), -0.1),
+)
+
+def classify_source(url: str) -> str:
+    """Classify a source by the highest-priority domain marker in its URL"""
+    found = set(_DOMAIN_RE.findall(url))
+    for marker, source_type in _DOMAIN_SOURCE_TYPES:
+        if marker in found:
+            return source_type
+    return "web"
+
+def assess_source_quality(url: str, title: str, source_type: Optional[str] = None) -> float:
+    """Score a source between 0 and 1 from its domain and title"""
+    quality_score = 0.5  # Base score
+
+    # URL-based quality assessment (reusing the source type when the caller already has it)
+    quality_score += _SOURCE_TYPE_QUALITY[source_type or classify_source(url)]
+
+    # Title-based quality assessment
+    for pattern, adjustment in _TITLE_QUALITY_RES:
+        if pattern.search(title):
+            quality_score += adjustment
+            break
+
+    # Ensure score is between 0 and 1
+    return max(0.0, min(1.0, quality_score))
+
+# ============================================================================
+# CONFLICT DETECTION
+# ============================================================================
+
+# Conflict indicators and the categories used to resolve them (first matching category wins)
+_CONFLICT_RE: Final = _keyword_pattern((
+    "conflict", "contradiction", "disagreement", "opposing", "differing",
+    "contrary", "inconsistent", "divergent", "clashing", "conflicting",
+    "however", "but", "although", "despite", "whereas", "while",
+    "on the other hand", "in contrast", "alternatively"
+))
+_CONFLICT_CATEGORY_KEYWORDS: Final = {
+    "temporal": ("recent", "latest", "new", "old", "dated", "current"),
+    "methodological": ("method", "approach", "study", "research", "analysis"),
+    "perspectival": ("perspective", "view", "opinion", "belief", "stance"),
+    "data_quality": ("quality", "reliable", "accurate", "valid", "credible"),
+}
+_CONFLICT_CATEGORY_RE, _CONFLICT_CATEGORY_GROUPS = _keyword_scanner(_invert_keywords(_CONFLICT_CATEGORY_KEYWORDS))
+
+CONFLICT_CATEGORIES: Final = tuple(_CONFLICT_CATEGORY_KEYWORDS)
+
+def extract_conflicts(content: str) -> List[str]:
+    """Return the stripped lines of the content that signal a conflict"""
+    return [line.strip() for line in content.split('\n') if _CONFLICT_RE.search(line)]
+
+def categorize_conflict(conflict: str) -> str:
+    """Return the conflict's category; the first in priority order wins, defaulting to perspectival"""
+    # One scan finds every category keyword
+    matched = _match_buckets(conflict, _CONFLICT_CATEGORY_RE, _CONFLICT_CATEGORY_GROUPS)
+    return next((category for category in CONFLICT_CATEGORIES if category in matched), "perspectival")
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Cache Persistence - Atomic JSON snapshot writes shared by the LLM and semantic caches
+Writes go through a unique temp file and are serialized so an older snapshot never replaces a newer one
+"""
+
+import os
+import asyncio
+import contextlib
+import logging
+import tempfile
+from typing import Any
+
+import orjson
+
+logger = logging.getLogger("deep_research")
+
+def write_atomic(path: str, data: bytes):
+    """Write bytes to path atomically via a unique temp file in the same directory"""
+    directory, name = os.path.split(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f"{name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+
+class SnapshotWriter:
+    """Persists successive snapshots of a cache to one JSON file, one write at a time, skipping superseded ones"""
+
+    def __init__(self, path: str, label: str, option: int = 0):
+        self.path = path
+        self.label = label  # used in warnings, e.g. "LLM cache"
+        self.option = option  # orjson.dumps option flags
+        self._lock = asyncio.Lock()
+        self._generation = 0  # number of snapshots handed to write()
+
+    async def write(self, snapshot: Any):
+        """Persist a snapshot unless a newer one is already queued (call right after taking it)"""
+        self._generation += 1
+        generation = self._generation
+
+        async with self._lock:
+            # A newer snapshot is waiting behind this one and will replace it anyway
+            if generation < self._generation:
+                return
+            try:
+                await asyncio.to_thread(write_atomic, self.path, orjson.dumps(snapshot, option=self.option))
+            except OSError as e:
+                logger.warning("⚠️  Could not persist %s to %s: %s", self.label, self.path, e)
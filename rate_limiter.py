@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Rate Limiter - Proactive async token buckets for the external APIs
+Callers wait before a request would exceed the quota instead of retrying after a 429
+"""
+
+import time
+import asyncio
+
+# ============================================================================
+# TOKEN BUCKET
+# ============================================================================
+
+class AsyncTokenBucket:
+    """Token bucket refilled at `rate` tokens per second, holding at most `capacity` tokens"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    async def acquire(self, tokens: float = 1):
+        """Wait until `tokens` are available, then take them"""
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot acquire {tokens} tokens from a bucket with capacity {self.capacity}")
+
+        # Waiters queue on the lock, so tokens are handed out in arrival order
+        async with self._lock:
+            self._refill()
+            if self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= tokens
+
+# Shared buckets, one per external API
+GEMINI_BUCKET = AsyncTokenBucket(rate=60 / 60, capacity=60)  # 60 requests per minute
+TAVILY_BUCKET = AsyncTokenBucket(rate=5, capacity=10)
+
+# Caps concurrent requests so parallel tasks cannot exhaust the connection pools; the buckets
+# above limit how fast requests start, these limit how many are in flight at once
+GEMINI_CONCURRENCY = asyncio.Semaphore(8)
+TAVILY_CONCURRENCY = asyncio.Semaphore(16)
@@ -6,6 +6,10 @@ Start the Chainlit UI for the Deep Research Agent System
 import subprocess
 import sys
 import os
+import importlib.util
+
+# Packages the research system imports at startup (checked without importing them)
+REQUIRED_MODULES = ("main", "agents", "openai", "httpx", "orjson", "dotenv")
 
 def main():
     """Start the Chainlit UI"""
@@ -20,21 +24,19 @@ def main():
         print("TAVILY_API_KEY=your_tavily_api_key_here")
         print()
     
-    # Check if chainlit is installed
-    try:
-        import chainlit
-        print("✅ Chainlit is installed")
-    except ImportError:
+    # Check if chainlit is installed (find_spec only locates it; chainlit is imported by the server)
+    if importlib.util.find_spec("chainlit") is None:
         print("❌ Chainlit not found. Installing...")
         subprocess.run([sys.executable, "-m", "pip", "install", "chainlit"])
+    else:
+        print("✅ Chainlit is installed")
     
-    # Check if research system can be imported
-    try:
-        from main import LeadResearchAgent
-        print("✅ Research system available")
-    except ImportError as e:
-        print(f"❌ Research system import error: {e}")
+    # Check if the research system and its dependencies are available
+    missing = [name for name in REQUIRED_MODULES if importlib.util.find_spec(name) is None]
+    if missing:
+        print(f"❌ Research system import error: missing {', '.join(missing)}")
         return
+    print("✅ Research system available")
     
     # Start the Chainlit app
     print("🌐 Starting web interface...")
@@ -42,8 +44,21 @@ def main():
     print("Press Ctrl+C to stop the server")
     print("=" * 60)
     
+    command = [sys.executable, "-m", "chainlit", "run", "app.py"]
+    
+    # On POSIX, replace this process with the server instead of waiting on a child process,
+    # so chainlit owns the PID and receives Ctrl+C directly. Windows exec spawns a detached
+    # process and exits (and does not quote arguments), so wait on a subprocess there.
+    if os.name == "posix":
+        sys.stdout.flush()  # exec discards anything still buffered
+        try:
+            os.execvp(sys.executable, command)
+        except OSError as e:
+            print(f"❌ Error starting the server: {e}")
+        return
+    
     try:
-        subprocess.run([sys.executable, "-m", "chainlit", "run", "app.py"])
+        subprocess.run(command)
     except KeyboardInterrupt:
         print("\n👋 Shutting down the server...")
     except Exception as e:
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Semantic Response Cache - Reuse final research reports for reworded questions
+Two-stage lookup: exact normalized question match, then embedding cosine similarity
+"""
+
+import os
+import time
+import asyncio
+import logging
+import functools
+import threading
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+import orjson
+
+from persistence import SnapshotWriter
+
+# numpy comes with sentence-transformers (semantic-cache extra) and is only imported once the model loads
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger("deep_research")
+
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+DEFAULT_SIMILARITY_THRESHOLD = 0.92
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+
+# ============================================================================
+# EMBEDDING MODEL
+# ============================================================================
+
+# The report and search caches may both load the model from worker threads at the same time
+_embedder_lock = threading.Lock()
+
+def load_embedder(model_name: str = DEFAULT_EMBEDDING_MODEL) -> Optional[Callable[[str], "np.ndarray"]]:
+    """Load a local sentence embedding model (once per name), or return None if it is unavailable"""
+    with _embedder_lock:
+        return _load_embedder(model_name)
+
+@functools.lru_cache(maxsize=None)
+def _load_embedder(model_name: str) -> Optional[Callable[[str], "np.ndarray"]]:
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        logger.warning("⚠️  sentence-transformers not installed - semantic cache disabled")
+        return None
+
+    import numpy as np
+
+    model = SentenceTransformer(model_name)
+
+    def embed(text: str) -> "np.ndarray":
+        return model.encode(text, normalize_embeddings=True).astype(np.float32)
+
+    logger.info("🧠 Semantic cache using %s", model_name)
+    return embed
+
+# ============================================================================
+# SEMANTIC CACHE
+# ============================================================================
+
+class SemanticCache:
+    """Cache of final reports keyed by question embedding similarity, with a TTL per entry"""
+
+    def __init__(self, embedder_loader: Callable[[], Optional[Callable[[str], "np.ndarray"]]],
+                 threshold: float = DEFAULT_SIMILARITY_THRESHOLD, max_entries: int = 512,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS, path: Optional[str] = None):
+        self.embedder_loader = embedder_loader  # e.g. load_embedder; called once, off the event loop, on first use
+        self.embed_fn: Optional[Callable[[str], "np.ndarray"]] = None
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self.stats = {"hits": 0, "misses": 0}
+        self._questions: List[str] = []
+        self._reports: List[str] = []
+        self._embeddings: Optional["np.ndarray"] = None  # one normalized embedding row per entry
+        self._expires: List[float] = []  # expiry time per entry (non-decreasing, entries are appended in order)
+        self._exact: Dict[str, int] = {}  # normalized question -> entry index
+        self._lock = asyncio.Lock()
+        self._writer = SnapshotWriter(path, "semantic cache", orjson.OPT_SERIALIZE_NUMPY) if path else None
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.embed_fn is not None
+
+    async def _ensure_loaded(self) -> bool:
+        """Load the embedding model and the persisted entries on first use, in a thread; return whether enabled"""
+        if not self._loaded:
+            async with self._load_lock:
+                if not self._loaded:
+                    self.embed_fn = await asyncio.to_thread(self.embedder_loader)
+                    if self.path and self.enabled:
+                        await asyncio.to_thread(self._load)
+                    self._loaded = True
+        return self.enabled
+
+    @staticmethod
+    def _normalize(question: str) -> str:
+        return " ".join(question.lower().split())
+
+    async def lookup(self, question: str) -> Optional[str]:
+        """Return a cached report for a question with a similar enough embedding"""
+        if not await self._ensure_loaded():
+            return None
+
+        self._drop_expired()
+
+        # Stage 1: exact match on the normalized question, no embedding needed
+        index = self._exact.get(self._normalize(question))
+        if index is not None:
+            self.stats["hits"] += 1
+            return self._reports[index]
+
+        if not self._questions:
+            self.stats["misses"] += 1
+            return None
+
+        # Stage 2: cosine similarity (embeddings are normalized, so one matrix-vector product scores every entry)
+        query = await asyncio.to_thread(self.embed_fn, question)
+
+        # Entries may have been dropped while the embedding was computed, so re-check after the await;
+        # the matrix and the reports are read together with no await in between, so their rows line up
+        embeddings, reports = self._embeddings, self._reports
+        if len(reports):
+            scores = embeddings @ query
+            best_index = int(scores.argmax())
+            if scores[best_index] >= self.threshold:
+                self.stats["hits"] += 1
+                return reports[best_index]
+
+        self.stats["misses"] += 1
+        return None
+
+    async def add(self, question: str, report: str):
+        """Store a report for a question"""
+        if not await self._ensure_loaded():
+            return
+
+        embedding = await asyncio.to_thread(self.embed_fn, question)
+        async with self._lock:
+            self._append(question, report, embedding, time.time() + self.ttl_seconds)
+            snapshot = self._snapshot() if self.path else None
+
+        if snapshot is not None:
+            await self._writer.write(snapshot)
+
+    def _append(self, question: str, report: str, embedding: "np.ndarray", expires_at: float):
+        import numpy as np
+
+        self._questions.append(question)
+        self._reports.append(report)
+        row = np.asarray(embedding, dtype=np.float32)[np.newaxis, :]
+        self._embeddings = row if self._embeddings is None else np.vstack((self._embeddings, row))
+        self._expires.append(expires_at)
+
+        # Drop the oldest entries once full
+        overflow = len(self._questions) - self.max_entries
+        if overflow > 0:
+            self._drop_oldest(overflow)
+        else:
+            self._exact[self._normalize(question)] = len(self._questions) - 1
+
+    def _drop_expired(self):
+        """Drop expired entries (they are always the oldest ones)"""
+        now = time.time()
+        expired = 0
+        while expired < len(self._expires) and self._expires[expired] < now:
+            expired += 1
+        if expired:
+            self._drop_oldest(expired)
+
+    def _drop_oldest(self, count: int):
+        """Drop the oldest entries and rebuild the exact-match index"""
+        del self._questions[:count]
+        del self._reports[:count]
+        self._embeddings = self._embeddings[count:]
+        del self._expires[:count]
+        self._exact = {self._normalize(q): i for i, q in enumerate(self._questions)}
+
+    def _snapshot(self) -> List[Dict]:
+        return [
+            {"question": q, "report": r, "embedding": e, "expires_at": x}
+            for q, r, e, x in zip(self._questions, self._reports, self._embeddings, self._expires)
+        ]
+
+    def _load(self):
+        """Load unexpired entries from the on-disk JSON file"""
+        import numpy as np
+
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "rb") as f:
+                entries = orjson.loads(f.read())
+        except (OSError, ValueError) as e:
+            logger.warning("⚠️  Could not load semantic cache from %s: %s", self.path, e)
+            return
+
+        # Entries saved without an expiry are treated as stale; keep the newest max_entries
+        now = time.time()
+        entries = [entry for entry in entries if entry.get("expires_at", 0) >= now][-self.max_entries:]
+        if not entries:
+            return
+
+        self._questions = [entry["question"] for entry in entries]
+        self._reports = [entry["report"] for entry in entries]
+        self._embeddings = np.asarray([entry["embedding"] for entry in entries], dtype=np.float32)
+        self._expires = [entry["expires_at"] for entry in entries]
+        self._exact = {self._normalize(q): i for i, q in enumerate(self._questions)}